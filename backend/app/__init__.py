@@ -1,11 +1,13 @@
-from flask import Flask
+from flask import Flask, jsonify
 from .config import Config
 from .extensions import db, jwt, cors, bcrypt
+from .services.upload_buffer import SpooledUploadRequest
 import os
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.request_class = SpooledUploadRequest
     
     # 确保上传目录存在
     try:
@@ -18,6 +20,13 @@ def create_app():
     db.init_app(app)
     jwt.init_app(app)
     
+    from .services.admin_principal import resolve_principal
+    
+    @jwt.token_in_blocklist_loader
+    def token_revoked(jwt_header, jwt_payload):
+        # 已删除（等待后台清理或已清理）的用户的令牌不再有效，身份按 jti 缓存
+        return resolve_principal(jwt_payload) is None
+    
     # 配置 CORS
     allowed_origins = os.environ.get('ALLOWED_ORIGINS', '*')
     if allowed_origins != '*':
@@ -29,6 +38,14 @@ def create_app():
     })
     bcrypt.init_app(app)
     
+    from .services.passwords import PasswordHasherBusy, hash_password
+    
+    @app.errorhandler(PasswordHasherBusy)
+    def password_hasher_busy(e):
+        response = jsonify({'success': False, 'message': '当前登录人数较多，请稍后重试'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    
     # 注册蓝图
     from .routes.auth import auth_bp
     from .routes.wordbooks import wordbooks_bp
@@ -36,6 +53,10 @@ def create_app():
     from .routes.progress import progress_bp
     from .routes.vocabulary import vocabulary_bp
     from .routes.admin import admin_bp
+    from .routes.learn import learn_bp
+    from .routes.review import review_bp
+    from .routes.events import events_bp
+    from .routes.search import search_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(wordbooks_bp, url_prefix='/api/wordbooks')
@@ -43,6 +64,15 @@ def create_app():
     app.register_blueprint(progress_bp, url_prefix='/api/progress')
     app.register_blueprint(vocabulary_bp, url_prefix='/api/vocabulary')
     app.register_blueprint(admin_bp, url_prefix='/admin')
+    app.register_blueprint(learn_bp, url_prefix='/api/learn')
+    app.register_blueprint(review_bp, url_prefix='/api/review')
+    app.register_blueprint(events_bp, url_prefix='/api/events')
+    app.register_blueprint(search_bp, url_prefix='/api/search')
+    
+    from .services.progress_buffer import init_progress_buffer
+    init_progress_buffer(app)
+    from .services.event_buffer import init_event_buffer
+    init_event_buffer(app)
     
     # 根路由
     @app.route('/')
@@ -65,11 +95,14 @@ def create_app():
         try:
             db.create_all()
             
+            from .services.schema import upgrade_schema
+            upgrade_schema()
+            
             # 创建主管理员账号
             from .models.user import User
             super_admin = User.query.filter_by(username='Haocheng.Tang').first()
             if not super_admin:
-                password_hash = bcrypt.generate_password_hash('Aa050213').decode('utf-8')
+                password_hash = hash_password('Aa050213')
                 super_admin = User(
                     username='Haocheng.Tang',
                     email='haocheng.tang@example.com',
@@ -83,4 +116,12 @@ def create_app():
             print(f'数据库初始化失败: {str(e)}')
             print('应用将继续运行，但数据库功能可能不可用')
     
+    # 上次进程中断的导入任务标记为失败
+    from .services.import_jobs import init_import_jobs
+    init_import_jobs(app)
+    
+    # 表结构就绪后再启动，继续清理上次未完成的删除
+    from .services.purge import init_purge_worker
+    init_purge_worker(app)
+    
     return app
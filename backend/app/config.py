@@ -21,6 +21,53 @@ class Config:
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # 管理后台统计数字多久（秒）在后台重新统计一次
+    ADMIN_STATS_TTL = int(os.environ.get('ADMIN_STATS_TTL', 300))
+    
+    # 管理后台按令牌缓存当前管理员身份的时间（秒）和最多缓存的令牌数
+    ADMIN_PRINCIPAL_TTL = int(os.environ.get('ADMIN_PRINCIPAL_TTL', 60))
+    ADMIN_PRINCIPAL_MAX_ENTRIES = int(os.environ.get('ADMIN_PRINCIPAL_MAX_ENTRIES', 10000))
+    
+    # 已上架单词书目录的进程内缓存时间（秒）
+    CATALOG_CACHE_TTL = int(os.environ.get('CATALOG_CACHE_TTL', 60))
+    
+    # 单词书内容的进程内缓存：最多缓存的单词总数，以及多久向数据库确认一次版本号（秒）
+    WORDBOOK_CACHE_MAX_WORDS = int(os.environ.get('WORDBOOK_CACHE_MAX_WORDS', 200000))
+    WORDBOOK_CACHE_REVALIDATE = int(os.environ.get('WORDBOOK_CACHE_REVALIDATE', 30))
+    # 批量单词接口允许浏览器和 nginx 直接复用的秒数，过期后用 ETag 重新验证
+    WORD_BATCH_MAX_AGE = int(os.environ.get('WORD_BATCH_MAX_AGE', 60))
+    # 单词搜索索引最多缓存的单词总数，超过时淘汰最久未搜索的单词书
+    SEARCH_INDEX_MAX_WORDS = int(os.environ.get('SEARCH_INDEX_MAX_WORDS', 200000))
+    
+    # 生词本总数的进程内缓存时间（秒）
+    VOCABULARY_TOTAL_TTL = int(os.environ.get('VOCABULARY_TOTAL_TTL', 300))
+    # 生词本成员集合（判断单词是否在生词本中）的重新加载间隔（秒）和最多缓存的用户数
+    VOCABULARY_MEMBERSHIP_TTL = int(os.environ.get('VOCABULARY_MEMBERSHIP_TTL', 600))
+    VOCABULARY_MEMBERSHIP_MAX_USERS = int(os.environ.get('VOCABULARY_MEMBERSHIP_MAX_USERS', 10000))
+    
+    # 学习进度延迟写入：只保留每本书的最新位置，按间隔（秒）或条数批量写入
+    # Vercel 在响应返回后会冻结函数，缓冲的进度可能丢失，默认改为立即写入
+    PROGRESS_WRITE_BEHIND = os.environ.get('PROGRESS_WRITE_BEHIND', '0' if os.environ.get('VERCEL') else '1') == '1'
+    PROGRESS_FLUSH_INTERVAL = float(os.environ.get('PROGRESS_FLUSH_INTERVAL', 5))
+    PROGRESS_FLUSH_SIZE = int(os.environ.get('PROGRESS_FLUSH_SIZE', 500))
+    # 读取进度前先把本进程缓冲的进度写入数据库，而不只是在返回结果中合并
+    PROGRESS_FLUSH_ON_READ = os.environ.get('PROGRESS_FLUSH_ON_READ', '0') == '1'
+    
+    # 学习事件批量写入：按间隔（秒）或条数批量插入，数据库不可用时内存中最多保留的条数
+    STUDY_EVENT_WRITE_BEHIND = os.environ.get('STUDY_EVENT_WRITE_BEHIND', '0' if os.environ.get('VERCEL') else '1') == '1'
+    STUDY_EVENT_FLUSH_INTERVAL = float(os.environ.get('STUDY_EVENT_FLUSH_INTERVAL', 10))
+    STUDY_EVENT_FLUSH_SIZE = int(os.environ.get('STUDY_EVENT_FLUSH_SIZE', 2000))
+    STUDY_EVENT_BUFFER_MAX = int(os.environ.get('STUDY_EVENT_BUFFER_MAX', 200000))
+    
+    # 复习：/api/review/next 取出的单词在这段时间内（秒）不会再次返回，0 表示不锁定
+    REVIEW_LEASE_SECONDS = int(os.environ.get('REVIEW_LEASE_SECONDS', 600))
+    
+    # 密码哈希：bcrypt 强度（调整后老用户在下次登录时按新强度重新计算），
+    # 计算线程数（0 表示 CPU 核数）和允许排队的任务数，排满后登录、注册返回 503
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0))
+    PASSWORD_HASH_QUEUE_MAX = int(os.environ.get('PASSWORD_HASH_QUEUE_MAX', 32))
+    
     # JWT 配置
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=1)
@@ -37,3 +84,25 @@ class Config:
         # 本地开发环境
         UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
+    # 上传文件在内存中缓冲的上限，超过后才写入匿名临时文件
+    UPLOAD_SPOOL_MAX_BYTES = int(os.environ.get('UPLOAD_SPOOL_MAX_BYTES', 8 * 1024 * 1024))
+    
+    # PDF 解析进程数，1 表示在请求线程内串行解析
+    PDF_PARSE_WORKERS = int(os.environ.get('PDF_PARSE_WORKERS', 1))
+    
+    # 解析结果缓存（UPLOAD_FOLDER/parse_cache）的最大字节数，0 表示关闭
+    PARSE_CACHE_MAX_BYTES = int(os.environ.get('PARSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    
+    # 后台导入任务
+    # Vercel 在响应返回后会冻结函数，后台线程无法继续执行，默认改为同步导入
+    IMPORT_ASYNC = os.environ.get('IMPORT_ASYNC', '0' if os.environ.get('VERCEL') else '1') == '1'
+    IMPORT_WORKERS = int(os.environ.get('IMPORT_WORKERS', 2))
+    # 结束的导入任务记录保留天数，0 表示不清理
+    IMPORT_JOB_RETENTION_DAYS = int(os.environ.get('IMPORT_JOB_RETENTION_DAYS', 7))
+    
+    # 删除单词书和用户：先标记隐藏，再由后台线程分批清理数据
+    # 每批删除的行数、批与批之间的停顿（秒），让其他写入有机会获得锁
+    # Vercel 上没有常驻线程，默认在删除请求内分批清理
+    PURGE_ASYNC = os.environ.get('PURGE_ASYNC', '0' if os.environ.get('VERCEL') else '1') == '1'
+    PURGE_BATCH_SIZE = int(os.environ.get('PURGE_BATCH_SIZE', 1000))
+    PURGE_BATCH_PAUSE = float(os.environ.get('PURGE_BATCH_PAUSE', 0.02))
@@ -1,5 +1,10 @@
 from .user import User
 from .wordbook import Wordbook
+from .lexeme import Lexeme
 from .word import Word
 from .user_progress import UserProgress
 from .vocabulary import Vocabulary
+from .import_job import ImportJob
+from .wordbook_snapshot import WordbookSnapshot
+from .review_state import ReviewState
+from .study_event import StudyEvent
@@ -0,0 +1,43 @@
+from ..extensions import db
+from datetime import datetime
+
+class ImportJob(db.Model):
+    __tablename__ = 'import_jobs'
+
+    id = db.Column(db.String(32), primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    kind = db.Column(db.String(10), nullable=False)  # pdf / excel
+    phase = db.Column(db.String(20), nullable=False, default='queued')  # queued / parsing / inserting / done / failed
+    rows_parsed = db.Column(db.Integer, default=0)
+    rows_inserted = db.Column(db.Integer, default=0)
+    wordbook_id = db.Column(db.Integer)
+    message = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    parsed_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    @staticmethod
+    def _seconds(start, end):
+        if not start or not end:
+            return None
+        return round((end - start).total_seconds(), 3)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'kind': self.kind,
+            'phase': self.phase,
+            'rows_parsed': self.rows_parsed,
+            'rows_inserted': self.rows_inserted,
+            'wordbook_id': self.wordbook_id,
+            'message': self.message,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'timings': {
+                'queued': self._seconds(self.created_at, self.started_at),
+                'parse': self._seconds(self.started_at, self.parsed_at),
+                'insert': self._seconds(self.parsed_at, self.finished_at),
+                'total': self._seconds(self.created_at, self.finished_at)
+            }
+        }
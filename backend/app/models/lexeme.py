@@ -0,0 +1,18 @@
+import hashlib
+from ..extensions import db
+
+class Lexeme(db.Model):
+    """去重后的词条（单词、音标、释义），多本单词书中相同的词条只存一份"""
+    __tablename__ = 'lexemes'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    # (word, phonetic, translation) 的 SHA-1 摘要（20 字节二进制），释义是长文本无法直接建唯一索引，用摘要去重
+    key_hash = db.Column(db.BINARY(20).with_variant(db.LargeBinary(), 'postgresql'), nullable=False, unique=True)
+    word = db.Column(db.String(100), nullable=False)
+    phonetic = db.Column(db.String(100))
+    translation = db.Column(db.Text, nullable=False)
+    
+    @staticmethod
+    def make_key(word, phonetic, translation):
+        raw = '\x1f'.join((word, phonetic or '', translation))
+        return hashlib.sha1(raw.encode('utf-8')).digest()
@@ -0,0 +1,36 @@
+from ..extensions import db
+from datetime import datetime
+
+class ReviewState(db.Model):
+    """间隔重复（SM-2）复习状态，每个用户每个单词一条"""
+    __tablename__ = 'review_states'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    word_id = db.Column(db.Integer, db.ForeignKey('words.id'), nullable=False)
+    repetitions = db.Column(db.Integer, nullable=False, default=0)  # 连续答对次数
+    interval_days = db.Column(db.Integer, nullable=False, default=0)
+    ease_factor = db.Column(db.Float, nullable=False, default=2.5)
+    lapses = db.Column(db.Integer, nullable=False, default=0)  # 遗忘次数
+    due_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_reviewed_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'word_id', name='unique_user_review_word'),
+        # 按到期时间取待复习单词时只扫描该用户的索引范围
+        db.Index('idx_user_due', 'user_id', 'due_at'),
+        # 删除单词书时按单词清理
+        db.Index('idx_review_word', 'word_id'),
+    )
+    
+    def to_dict(self):
+        return {
+            'word_id': self.word_id,
+            'repetitions': self.repetitions,
+            'interval_days': self.interval_days,
+            'ease_factor': round(self.ease_factor, 2),
+            'lapses': self.lapses,
+            'due_at': self.due_at.isoformat() if self.due_at else None,
+            'last_reviewed_at': self.last_reviewed_at.isoformat() if self.last_reviewed_at else None
+        }
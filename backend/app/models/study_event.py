@@ -0,0 +1,23 @@
+from ..extensions import db
+from datetime import datetime
+
+class StudyEvent(db.Model):
+    """学习事件，只追加不修改
+
+    不设外键，也不设除主键外的唯一约束：写入时不做额外检查，
+    之后也可以按 occurred_at 范围整段归档、删除或改为按月分区。
+    """
+    __tablename__ = 'study_events'
+    
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    word_id = db.Column(db.Integer, nullable=False)
+    wordbook_id = db.Column(db.Integer)
+    action = db.Column(db.String(16), nullable=False)  # studied / known / forgotten / skipped / vocab_add / vocab_remove
+    occurred_at = db.Column(db.DateTime, nullable=False)  # 客户端记录的时间
+    received_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('idx_event_user_time', 'user_id', 'occurred_at'),
+        db.Index('idx_event_time', 'occurred_at'),
+    )
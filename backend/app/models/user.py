@@ -11,6 +11,7 @@ class User(db.Model):
     is_admin = db.Column(db.Boolean, default=False)
     is_super_admin = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    deleted_at = db.Column(db.DateTime)  # 已删除、等待后台清理，不能再登录
     
     # 关系
     progress = db.relationship('UserProgress', backref='user', lazy='dynamic')
@@ -11,6 +11,9 @@ class Vocabulary(db.Model):
     
     __table_args__ = (
         db.UniqueConstraint('user_id', 'word_id', name='unique_user_word'),
+        db.Index('idx_user_added', 'user_id', 'added_at'),
+        # 删除单词书时按单词清理
+        db.Index('idx_vocabulary_word', 'word_id'),
     )
     
     word = db.relationship('Word', backref='in_vocabulary')
@@ -2,21 +2,35 @@ from ..extensions import db
 from datetime import datetime
 
 class Word(db.Model):
+    """单词书中的一个位置，内容在 lexemes 表中"""
     __tablename__ = 'words'
     
     id = db.Column(db.Integer, primary_key=True)
     wordbook_id = db.Column(db.Integer, db.ForeignKey('wordbooks.id'), nullable=False)
-    word = db.Column(db.String(100), nullable=False)
-    phonetic = db.Column(db.String(100))
-    translation = db.Column(db.Text, nullable=False)
+    lexeme_id = db.Column(db.Integer, db.ForeignKey('lexemes.id'), nullable=False)
     sort_order = db.Column(db.Integer, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # 加载单词时总是一起取出词条
+    lexeme = db.relationship('Lexeme', lazy='joined', innerjoin=True)
+    
     __table_args__ = (
         db.UniqueConstraint('wordbook_id', 'sort_order', name='unique_wordbook_sequence'),
         db.Index('idx_wordbook_sequence', 'wordbook_id', 'sort_order'),
     )
     
+    @property
+    def word(self):
+        return self.lexeme.word
+    
+    @property
+    def phonetic(self):
+        return self.lexeme.phonetic
+    
+    @property
+    def translation(self):
+        return self.lexeme.translation
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -10,7 +10,9 @@ class Wordbook(db.Model):
     pdf_filename = db.Column(db.String(255))
     word_count = db.Column(db.Integer, default=0)
     is_active = db.Column(db.Boolean, default=True)  # 上架/下架状态
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # 内容或状态变化时递增，用于缓存失效
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    deleted_at = db.Column(db.DateTime)  # 已删除、等待后台清理，不再对任何人可见
     
     # 关系
     words = db.relationship('Word', backref='wordbook', lazy='dynamic', cascade='all, delete-orphan')
@@ -22,5 +24,6 @@ class Wordbook(db.Model):
             'description': self.description,
             'word_count': self.word_count,
             'is_active': self.is_active,
+            'version': self.version,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
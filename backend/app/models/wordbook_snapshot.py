@@ -0,0 +1,12 @@
+from ..extensions import db
+from datetime import datetime
+
+class WordbookSnapshot(db.Model):
+    """单词书整本内容的预生成快照（gzip 压缩的列式 JSON），每本只保留最新版本"""
+    __tablename__ = 'wordbook_snapshots'
+    
+    wordbook_id = db.Column(db.Integer, db.ForeignKey('wordbooks.id'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    # MySQL 的 BLOB 只有 64KB，指定长度以使用 LONGBLOB
+    data = db.Column(db.LargeBinary(length=2 ** 32 - 1), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -1,17 +1,63 @@
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, send_from_directory, session, make_response
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, send_from_directory, session, make_response, Response, stream_with_context, g
 from app.models.wordbook import Wordbook
 from app.models.word import Word
+from app.models.lexeme import Lexeme
 from app.models.user import User
-from app.extensions import db, bcrypt
-from app.services.PDF_reader import extract_words_from_pdf
-from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
+from app.extensions import db
+from app.services.word_importer import import_wordbook
+from app.services.parse_cache import get_parse_cache, parse_upload
+from app.services.import_jobs import submit_import, get_job
+from app.services.upload_buffer import detach_upload
+from app.services.catalog_cache import invalidate_catalog
+from app.services.wordbook_cache import bump_version, invalidate_wordbook
+from app.services.snapshot import delete_snapshot
+from app.services.progress_buffer import discard_progress
+from app.services.admin_stats import get_dashboard_stats, adjust_stats
+from app.services.search_index import drop_wordbook
+from app.services.lexicon import resolve_lexemes
+from app.services.purge import schedule_purge
+from app.services.passwords import hash_password, check_password, rehash_if_needed, hasher_stats
+from app.services.admin_principal import resolve_principal, invalidate_principal, principal_cache_stats
+from flask_jwt_extended import jwt_required, create_access_token
 from app.config import Config
-from datetime import timedelta
+from datetime import datetime, timedelta
+from urllib.parse import quote
+import csv
+import io
 import os
-from werkzeug.utils import secure_filename
+import uuid
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+# 管理后台单词列表每次加载的条数，以及导出时每批读取的行数
+WORD_PAGE_SIZE = 200
+MAX_WORD_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+
+def _get_wordbook_or_404(wordbook_id):
+    """取未删除的单词书"""
+    return Wordbook.query.filter_by(id=wordbook_id, deleted_at=None).first_or_404()
+
+def _wordbook_changed(wordbook, **deltas):
+    """单词书内容或状态修改后调用：增加版本号并提交，失效目录和内容缓存，按 deltas 调整统计数字"""
+    wordbook_id = wordbook.id
+    bump_version(wordbook)
+    db.session.commit()
+    invalidate_catalog()
+    invalidate_wordbook(wordbook_id)
+    adjust_stats(**deltas)
+
+def _hide_wordbook(wordbook):
+    """标记删除单词书：立即对所有接口不可见，单词、生词、进度等由后台分批清理"""
+    wordbook_id, word_count, is_active = wordbook.id, wordbook.word_count, wordbook.is_active
+    discard_progress(wordbook_id=wordbook_id)
+    wordbook.deleted_at = datetime.utcnow()
+    wordbook.is_active = False
+    delete_snapshot(wordbook_id)
+    _wordbook_changed(wordbook, total_wordbooks=-1, active_wordbooks=-int(is_active), total_words=-word_count)
+    drop_wordbook(wordbook_id)
+    schedule_purge()
+
 def admin_required(f):
     def decorated_function(*args, **kwargs):
         try:
@@ -20,14 +66,14 @@ def admin_required(f):
             if not token:
                 return redirect(url_for('admin.login'))
             
-            # 验证 token
+            # 验证 token，身份按 jti 缓存
             from flask_jwt_extended import decode_token
             decoded = decode_token(token)
-            user_id = decoded['sub']
             
-            user = User.query.get(user_id)
-            if not user or not user.is_admin:
+            principal = resolve_principal(decoded)
+            if not principal or not principal.is_admin:
                 return redirect(url_for('admin.login'))
+            g.admin_principal = principal
         except Exception as e:
             print(f'认证失败: {str(e)}')
             return redirect(url_for('admin.login'))
@@ -46,11 +92,14 @@ def login():
         if not username or not password:
             return jsonify({'success': False, 'message': '用户名和密码不能为空'}), 400
         
-        user = User.query.filter_by(username=username).first()
+        user = User.query.filter_by(username=username, deleted_at=None).first()
         
-        if not user or not bcrypt.check_password_hash(user.password_hash, password):
+        if not user or not check_password(user.password_hash, password):
             return jsonify({'success': False, 'message': '用户名或密码错误'}), 401
         
+        if rehash_if_needed(user, password):
+            db.session.commit()
+        
         if not user.is_admin:
             return jsonify({'success': False, 'message': '您没有管理员权限'}), 403
         
@@ -82,30 +131,86 @@ def logout():
 @admin_bp.route('/')
 @admin_required
 def index():
-    total_wordbooks = Wordbook.query.count()
-    active_wordbooks = Wordbook.query.filter_by(is_active=True).count()
-    total_words = Word.query.count()
-    total_users = User.query.count()
-    return render_template('admin/index.html', 
-                           total_wordbooks=total_wordbooks, 
-                           active_wordbooks=active_wordbooks, 
-                           total_words=total_words, 
-                           total_users=total_users)
+    # 统计数字来自缓存快照，不在每次打开首页时 COUNT(*)
+    return render_template('admin/index.html', **get_dashboard_stats())
 
 @admin_bp.route('/wordbooks')
 @admin_required
 def wordbooks():
     page = request.args.get('page', 1, type=int)
     per_page = 10
-    pagination = Wordbook.query.order_by(Wordbook.created_at.desc()).paginate(page=page, per_page=per_page)
+    pagination = Wordbook.query.filter(Wordbook.deleted_at.is_(None)).order_by(Wordbook.created_at.desc()).paginate(page=page, per_page=per_page)
     return render_template('admin/wordbooks.html', wordbooks=pagination.items, pagination=pagination)
 
 @admin_bp.route('/wordbooks/<int:wordbook_id>/words')
 @admin_required
 def wordbook_words(wordbook_id):
-    wordbook = Wordbook.query.get_or_404(wordbook_id)
-    words = Word.query.filter_by(wordbook_id=wordbook_id).order_by(Word.sort_order).all()
-    return render_template('admin/wordbook_words.html', wordbook=wordbook, words=words)
+    wordbook = _get_wordbook_or_404(wordbook_id)
+    # 页面只渲染框架和统计，单词由 /api/wordbooks/<id>/words 按范围加载
+    max_sequence, phonetic_count = db.session.query(
+        db.func.max(Word.sort_order),
+        db.func.count(db.func.nullif(Lexeme.phonetic, ''))
+    ).join(Lexeme, Lexeme.id == Word.lexeme_id).filter(Word.wordbook_id == wordbook_id).one()
+    return render_template('admin/wordbook_words.html',
+                           wordbook=wordbook,
+                           max_sequence=max_sequence or 0,
+                           phonetic_count=phonetic_count)
+
+@admin_bp.route('/api/wordbooks/<int:wordbook_id>/words', methods=['GET'])
+@admin_required
+def api_list_words(wordbook_id):
+    """按序号范围返回单词，沿 idx_wordbook_sequence 索引读取 [start, start + limit)"""
+    start = max(request.args.get('start', 1, type=int), 1)
+    limit = min(max(request.args.get('limit', WORD_PAGE_SIZE, type=int), 1), MAX_WORD_PAGE_SIZE)
+    
+    rows = db.session.query(
+        Word.sort_order, Lexeme.word, Lexeme.phonetic, Lexeme.translation, Word.created_at
+    ).join(Lexeme, Lexeme.id == Word.lexeme_id).filter(
+        Word.wordbook_id == wordbook_id,
+        Word.sort_order >= start,
+        Word.sort_order < start + limit
+    ).order_by(Word.sort_order).all()
+    
+    return jsonify({
+        'success': True,
+        'words': [
+            {
+                'sequence': sort_order,
+                'word': word,
+                'phonetic': phonetic,
+                'translation': translation,
+                'created_at': created_at.strftime('%Y-%m-%d') if created_at else None
+            }
+            for sort_order, word, phonetic, translation, created_at in rows
+        ]
+    })
+
+@admin_bp.route('/wordbooks/<int:wordbook_id>/export')
+@admin_required
+def export_words(wordbook_id):
+    """流式导出 CSV（带 BOM，Excel 可直接打开），按批读取，不把整本单词书放进内存"""
+    wordbook = _get_wordbook_or_404(wordbook_id)
+    filename = f'{wordbook.name}_单词列表.csv'
+    
+    def generate():
+        yield '\ufeff'
+        yield _csv_line(['序号', '英文单词', '音标', '中文翻译'])
+        rows = db.session.query(
+            Word.sort_order, Lexeme.word, Lexeme.phonetic, Lexeme.translation
+        ).join(Lexeme, Lexeme.id == Word.lexeme_id).filter(
+            Word.wordbook_id == wordbook_id
+        ).order_by(Word.sort_order).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        for sort_order, word, phonetic, translation in rows:
+            yield _csv_line([sort_order, word, phonetic or '', translation])
+    
+    response = Response(stream_with_context(generate()), mimetype='text/csv')
+    response.headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filename)}"
+    return response
+
+def _csv_line(values):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
 
 @admin_bp.route('/upload', methods=['GET', 'POST'])
 @admin_required
@@ -122,88 +227,55 @@ def upload():
         if not wordbook_name:
             return jsonify({'success': False, 'message': '请输入单词书名称'}), 400
         
-        filename = secure_filename(file.filename)
-        upload_dir = Config.UPLOAD_FOLDER
-        if not os.path.exists(upload_dir):
-            os.makedirs(upload_dir)
-        
-        file_path = os.path.join(upload_dir, filename)
-        file.save(file_path)
-        
         try:
-            if filename.lower().endswith('.pdf'):
-                words = extract_words_from_pdf(file_path)
-            else:
-                from app.services.excel_parser import parse_excel
-                words = parse_excel(file_path)
+            kind = 'pdf' if file.filename.lower().endswith('.pdf') else 'excel'
+            words = parse_upload(file.stream, kind)
             
             if not words:
                 return jsonify({'success': False, 'message': '未找到有效的单词数据'}), 400
             
-            wordbook = Wordbook(name=wordbook_name, word_count=len(words), is_active=True)
-            db.session.add(wordbook)
-            db.session.flush()
-            
-            for idx, (word, phonetic, translation) in enumerate(words, 1):
-                db_word = Word(
-                    wordbook_id=wordbook.id,
-                    word=word,
-                    phonetic=phonetic,
-                    translation=translation,
-                    sort_order=idx
-                )
-                db.session.add(db_word)
+            wordbook, stats = import_wordbook(wordbook_name, words, is_active=True)
             
-            db.session.commit()
-            
-            return jsonify({'success': True, 'message': f'成功导入 {len(words)} 个单词', 'wordbook_id': wordbook.id})
+            return jsonify({'success': True, 'message': f'成功导入 {len(words)} 个单词', 'wordbook_id': wordbook.id, 'rows_per_sec': stats['rows_per_sec']})
         
         except Exception as e:
             db.session.rollback()
             return jsonify({'success': False, 'message': str(e)}), 500
-        
-        finally:
-            if os.path.exists(file_path):
-                os.remove(file_path)
     
     return render_template('admin/upload.html')
 
 @admin_bp.route('/wordbooks/<int:wordbook_id>/toggle', methods=['POST'])
 @admin_required
 def toggle_wordbook(wordbook_id):
-    wordbook = Wordbook.query.get_or_404(wordbook_id)
+    wordbook = _get_wordbook_or_404(wordbook_id)
     wordbook.is_active = not wordbook.is_active
-    db.session.commit()
+    _wordbook_changed(wordbook, active_wordbooks=1 if wordbook.is_active else -1)
     return redirect(url_for('admin.wordbooks'))
 
 @admin_bp.route('/wordbooks/<int:wordbook_id>/delete', methods=['POST'])
 @admin_required
 def delete_wordbook(wordbook_id):
-    wordbook = Wordbook.query.get_or_404(wordbook_id)
-    Word.query.filter_by(wordbook_id=wordbook_id).delete()
-    db.session.delete(wordbook)
-    db.session.commit()
+    wordbook = _get_wordbook_or_404(wordbook_id)
+    _hide_wordbook(wordbook)
     return redirect(url_for('admin.wordbooks'))
 
 @admin_bp.route('/api/wordbooks/<int:wordbook_id>/toggle', methods=['POST'])
 def api_toggle_wordbook(wordbook_id):
-    wordbook = Wordbook.query.get_or_404(wordbook_id)
+    wordbook = _get_wordbook_or_404(wordbook_id)
     wordbook.is_active = not wordbook.is_active
-    db.session.commit()
+    _wordbook_changed(wordbook, active_wordbooks=1 if wordbook.is_active else -1)
     action = '上架' if wordbook.is_active else '下架'
     return jsonify({'success': True, 'message': f'词库已{action}'})
 
 @admin_bp.route('/api/wordbooks/<int:wordbook_id>', methods=['DELETE'])
 def api_delete_wordbook(wordbook_id):
-    wordbook = Wordbook.query.get_or_404(wordbook_id)
-    Word.query.filter_by(wordbook_id=wordbook_id).delete()
-    db.session.delete(wordbook)
-    db.session.commit()
+    wordbook = _get_wordbook_or_404(wordbook_id)
+    _hide_wordbook(wordbook)
     return jsonify({'success': True, 'message': '词库已删除'})
 
 @admin_bp.route('/api/wordbooks/<int:wordbook_id>/words', methods=['POST'])
 def api_add_word(wordbook_id):
-    wordbook = Wordbook.query.get_or_404(wordbook_id)
+    wordbook = _get_wordbook_or_404(wordbook_id)
     data = request.get_json()
     
     if not data:
@@ -218,17 +290,16 @@ def api_add_word(wordbook_id):
     
     max_sort_order = db.session.query(db.func.max(Word.sort_order)).filter_by(wordbook_id=wordbook_id).scalar() or 0
     
+    (lexeme_id,), _ = resolve_lexemes([(word_text, phonetic, translation)])
     new_word = Word(
         wordbook_id=wordbook_id,
-        word=word_text,
-        phonetic=phonetic,
-        translation=translation,
+        lexeme_id=lexeme_id,
         sort_order=max_sort_order + 1
     )
     
     db.session.add(new_word)
     wordbook.word_count = wordbook.word_count + 1
-    db.session.commit()
+    _wordbook_changed(wordbook, total_words=1)
     
     return jsonify({'success': True, 'message': '单词添加成功'})
 
@@ -245,46 +316,20 @@ def api_upload_excel():
     if not wordbook_name:
         return jsonify({'success': False, 'message': '请输入单词书名称'}), 400
     
-    filename = secure_filename(file.filename)
-    upload_dir = Config.UPLOAD_FOLDER
-    if not os.path.exists(upload_dir):
-        os.makedirs(upload_dir)
-    
-    file_path = os.path.join(upload_dir, filename)
-    file.save(file_path)
+    # 直接把上传缓冲区交给导入任务，不经过 UPLOAD_FOLDER
+    source = detach_upload(file)
     
     try:
-        from app.services.excel_parser import parse_excel
-        words = parse_excel(file_path)
-        
-        if not words:
-            return jsonify({'success': False, 'message': '未找到有效的单词数据'}), 400
-        
-        wordbook = Wordbook(name=wordbook_name, word_count=len(words), is_active=False)
-        db.session.add(wordbook)
-        db.session.flush()
-        
-        for idx, (word, phonetic, translation) in enumerate(words, 1):
-            db_word = Word(
-                wordbook_id=wordbook.id,
-                word=word,
-                phonetic=phonetic,
-                translation=translation,
-                sort_order=idx
-            )
-            db.session.add(db_word)
-        
-        db.session.commit()
-        
-        return jsonify({'success': True, 'message': f'成功导入 {len(words)} 个单词', 'word_count': len(words), 'wordbook_id': wordbook.id})
-    
+        job_id = submit_import(source, 'excel', wordbook_name, is_active=False)
     except Exception as e:
         db.session.rollback()
+        source.close()
         return jsonify({'success': False, 'message': str(e)}), 500
     
-    finally:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+    job = get_job(job_id)
+    # 同步模式下任务已经执行完毕
+    status = 200 if job['phase'] in ('done', 'failed') else 202
+    return jsonify({'success': True, 'message': '导入任务已提交', 'job_id': job_id, 'job': job}), status
 
 @admin_bp.route('/download/desktop-app')
 @admin_required
@@ -309,53 +354,48 @@ def api_convert_pdf():
     if not wordbook_name:
         return jsonify({'success': False, 'message': '请输入单词书名称'}), 400
     
-    filename = secure_filename(file.filename)
-    upload_dir = Config.UPLOAD_FOLDER
-    if not os.path.exists(upload_dir):
-        os.makedirs(upload_dir)
-    
-    file_path = os.path.join(upload_dir, filename)
-    file.save(file_path)
+    # 直接把上传缓冲区交给导入任务，不经过 UPLOAD_FOLDER
+    source = detach_upload(file)
     
     try:
-        words = extract_words_from_pdf(file_path)
-        
-        if not words:
-            return jsonify({'success': False, 'message': '未找到有效的单词数据'}), 400
-        
-        wordbook = Wordbook(name=wordbook_name, word_count=len(words), is_active=False)
-        db.session.add(wordbook)
-        db.session.flush()
-        
-        for idx, (word, phonetic, translation) in enumerate(words, 1):
-            db_word = Word(
-                wordbook_id=wordbook.id,
-                word=word,
-                phonetic=phonetic,
-                translation=translation,
-                sort_order=idx
-            )
-            db.session.add(db_word)
-        
-        db.session.commit()
-        
-        return jsonify({'success': True, 'message': f'成功导入 {len(words)} 个单词', 'word_count': len(words), 'wordbook_id': wordbook.id})
-    
+        job_id = submit_import(source, 'pdf', wordbook_name, is_active=False)
     except Exception as e:
         db.session.rollback()
+        source.close()
         return jsonify({'success': False, 'message': str(e)}), 500
     
-    finally:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+    job = get_job(job_id)
+    # 同步模式下任务已经执行完毕
+    status = 200 if job['phase'] in ('done', 'failed') else 202
+    return jsonify({'success': True, 'message': '导入任务已提交', 'job_id': job_id, 'job': job}), status
+
+@admin_bp.route('/api/jobs/<job_id>', methods=['GET'])
+@admin_required
+def api_get_job(job_id):
+    job = get_job(job_id)
+    if not job:
+        return jsonify({'success': False, 'message': '任务不存在'}), 404
+    return jsonify({'success': True, 'job': job})
+
+@admin_bp.route('/api/parse-cache', methods=['GET'])
+@admin_required
+def api_parse_cache_stats():
+    return jsonify({'success': True, 'stats': get_parse_cache().stats()})
+
+@admin_bp.route('/api/password-hasher', methods=['GET'])
+@admin_required
+def api_password_hasher_stats():
+    return jsonify({'success': True, 'stats': hasher_stats()})
+
+@admin_bp.route('/api/principal-cache', methods=['GET'])
+@admin_required
+def api_principal_cache_stats():
+    return jsonify({'success': True, 'stats': principal_cache_stats()})
 
 @admin_bp.route('/api/admin/add', methods=['POST'])
 @admin_required
 def add_admin():
-    user_id = get_jwt_identity()
-    current_user = User.query.get(user_id)
-    
-    if not current_user or not current_user.is_super_admin:
+    if not g.admin_principal.is_super_admin:
         return jsonify({'success': False, 'message': '只有主管理员才能添加副管理员'}), 403
     
     data = request.get_json()
@@ -383,7 +423,7 @@ def add_admin():
     if User.query.filter_by(email=email).first():
         return jsonify({'success': False, 'message': '邮箱已被注册'}), 400
     
-    password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+    password_hash = hash_password(password)
     new_admin = User(
         username=username,
         email=email,
@@ -394,6 +434,7 @@ def add_admin():
     
     db.session.add(new_admin)
     db.session.commit()
+    adjust_stats(total_users=1)
     
     return jsonify({'success': True, 'message': '副管理员添加成功', 'admin': new_admin.to_dict()})
 
@@ -402,28 +443,30 @@ def add_admin():
 def users():
     page = request.args.get('page', 1, type=int)
     per_page = 20
-    pagination = User.query.order_by(User.created_at.desc()).paginate(page=page, per_page=per_page)
+    pagination = User.query.filter(User.deleted_at.is_(None)).order_by(User.created_at.desc()).paginate(page=page, per_page=per_page)
     return render_template('admin/users.html', users=pagination.items, pagination=pagination)
 
 @admin_bp.route('/api/users/<int:user_id>', methods=['DELETE'])
 @admin_required
 def delete_user(user_id):
-    token = request.cookies.get('admin_token')
-    from flask_jwt_extended import decode_token
-    decoded = decode_token(token)
-    current_user_id = decoded['sub']
-    
-    current_user = User.query.get(current_user_id)
-    
-    user = User.query.get_or_404(user_id)
+    user = User.query.filter_by(id=user_id, deleted_at=None).first_or_404()
     
     if user.is_super_admin:
         return jsonify({'success': False, 'message': '不能删除主管理员账号'}), 403
     
-    if current_user.id == user.id:
+    if g.admin_principal.user_id == user.id:
         return jsonify({'success': False, 'message': '不能删除自己的账号'}), 403
     
-    db.session.delete(user)
+    # 标记删除后立即不能登录，生词、进度、复习记录等由后台分批清理
+    user.deleted_at = datetime.utcnow()
+    # 用户名和邮箱有唯一约束，换成随机占位值立即释放，不必等清理完成就能重新注册
+    placeholder = f'deleted-{user.id}-{uuid.uuid4().hex[:12]}'
+    user.username = placeholder
+    user.email = f'{placeholder}@deleted.invalid'
     db.session.commit()
+    invalidate_principal(user.id)
+    discard_progress(user_id=user.id)
+    adjust_stats(total_users=-1)
+    schedule_purge()
     
     return jsonify({'success': True, 'message': '用户已删除'})
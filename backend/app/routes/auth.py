@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
-from ..extensions import db, bcrypt
+from sqlalchemy.exc import IntegrityError
+from ..extensions import db
 from ..models.user import User
+from ..services.admin_stats import adjust_stats
+from ..services.passwords import hash_password, check_password, rehash_if_needed
 from datetime import timedelta
 
 auth_bp = Blueprint('auth', __name__)
@@ -31,7 +34,7 @@ def register():
         return jsonify({'success': False, 'message': '邮箱已被注册'}), 400
     
     # 创建新用户
-    password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+    password_hash = hash_password(password)
     user = User(username=username, email=email, password_hash=password_hash)
     
     # 第一个用户设为管理员
@@ -39,7 +42,13 @@ def register():
         user.is_admin = True
     
     db.session.add(user)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # 同时注册同一用户名或邮箱
+        db.session.rollback()
+        return jsonify({'success': False, 'message': '用户名或邮箱已被注册'}), 400
+    adjust_stats(total_users=1)
     
     return jsonify({'success': True, 'message': '注册成功'}), 201
 
@@ -57,11 +66,14 @@ def login():
     if not email or not password:
         return jsonify({'success': False, 'message': '邮箱和密码不能为空'}), 400
     
-    user = User.query.filter_by(email=email).first()
+    user = User.query.filter_by(email=email, deleted_at=None).first()
     
-    if not user or not bcrypt.check_password_hash(user.password_hash, password):
+    if not user or not check_password(user.password_hash, password):
         return jsonify({'success': False, 'message': '邮箱或密码错误'}), 401
     
+    if rehash_if_needed(user, password):
+        db.session.commit()
+    
     access_token = create_access_token(
         identity=str(user.id),
         expires_delta=timedelta(days=1)
@@ -93,7 +105,7 @@ def get_current_user():
     user_id = int(get_jwt_identity())
     user = User.query.get(user_id)
     
-    if not user:
+    if not user or user.deleted_at:
         return jsonify({'success': False, 'message': '用户不存在'}), 404
     
     return jsonify({'success': True, 'user': user.to_dict()})
@@ -0,0 +1,100 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import datetime, timedelta
+from ..extensions import db
+from ..models.study_event import StudyEvent
+from ..services.event_buffer import record_events, flush_events
+from ..services.validation import is_valid_id
+
+events_bp = Blueprint('events', __name__)
+
+STUDY_ACTIONS = {'studied', 'known', 'forgotten', 'skipped', 'vocab_add', 'vocab_remove'}
+# 一次请求最多包含的事件数
+MAX_EVENTS = 1000
+MAX_SUMMARY_DAYS = 365
+
+
+def _parse_timestamp(value, now):
+    """客户端时间戳：毫秒时间戳或 ISO 格式（UTC），格式错误返回 None；超前于服务器时间的按当前时间记录"""
+    try:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            occurred_at = datetime.utcfromtimestamp(value / 1000)
+        elif isinstance(value, str):
+            occurred_at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if occurred_at.tzinfo:
+                occurred_at = (occurred_at - occurred_at.utcoffset()).replace(tzinfo=None)
+        else:
+            return None
+    except (ValueError, OverflowError, OSError):
+        return None
+    return min(occurred_at, now)
+
+
+@events_bp.route('', methods=['POST'])
+@jwt_required()
+def ingest_events():
+    """批量上报学习事件
+
+    请求体 {"events": [{"word_id": 1, "action": "studied", "timestamp": 1700000000000, "wordbook_id": 2}, ...]}。
+    事件先进入缓冲区，与其他请求的事件合并后批量插入。
+    """
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    items = data.get('events')
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'success': False, 'message': '请提供事件列表'}), 400
+    if len(items) > MAX_EVENTS:
+        return jsonify({'success': False, 'message': f'一次最多上报 {MAX_EVENTS} 个事件'}), 400
+    
+    now = datetime.utcnow()
+    events = []
+    for item in items:
+        if not isinstance(item, dict):
+            return jsonify({'success': False, 'message': '事件格式无效'}), 400
+        word_id = item.get('word_id')
+        wordbook_id = item.get('wordbook_id')
+        action = item.get('action')
+        occurred_at = _parse_timestamp(item.get('timestamp'), now)
+        if (not is_valid_id(word_id) or action not in STUDY_ACTIONS or occurred_at is None
+                or (wordbook_id is not None and not is_valid_id(wordbook_id))):
+            return jsonify({'success': False, 'message': '事件格式无效'}), 400
+        events.append({
+            'user_id': user_id,
+            'word_id': word_id,
+            'wordbook_id': wordbook_id,
+            'action': action,
+            'occurred_at': occurred_at,
+            'received_at': now
+        })
+    
+    record_events(events)
+    
+    return jsonify({'success': True, 'accepted': len(events)}), 202
+
+
+@events_bp.route('/summary', methods=['GET'])
+@jwt_required()
+def get_summary():
+    """最近 days 天每天各类事件的数量"""
+    user_id = int(get_jwt_identity())
+    days = min(max(request.args.get('days', 30, type=int), 1), MAX_SUMMARY_DAYS)
+    since = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days - 1)
+    
+    # 先写入缓冲中的事件，保证刚上报的事件能被统计到
+    flush_events()
+    
+    day = db.func.date(StudyEvent.occurred_at)
+    rows = db.session.query(day, StudyEvent.action, db.func.count()).filter(
+        StudyEvent.user_id == user_id,
+        StudyEvent.occurred_at >= since
+    ).group_by(day, StudyEvent.action).order_by(day).all()
+    
+    return jsonify({
+        'success': True,
+        'days': days,
+        'summary': [
+            {'date': str(date), 'action': action, 'count': count}
+            for date, action, count in rows
+        ]
+    })
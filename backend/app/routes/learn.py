@@ -0,0 +1,95 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import datetime
+from ..extensions import db
+from ..models.user_progress import UserProgress
+from ..services.progress_buffer import pending_progress, discard_progress, progress_upsert
+from ..services.vocabulary_cache import get_membership
+from ..services.wordbook_cache import get_wordbook_content
+from ..services.validation import is_int
+
+learn_bp = Blueprint('learn', __name__)
+
+DEFAULT_PREFETCH = 5
+MAX_PREFETCH = 20
+
+
+@learn_bp.route('/<int:wordbook_id>/advance', methods=['POST'])
+@jwt_required()
+def advance(wordbook_id):
+    """移动学习进度并返回目标单词和预取窗口
+
+    请求体 {"index": n} 跳到第 n 个单词，或 {"step": 1 / -1} 相对移动；
+    可选 "prefetch" 指定额外返回其后多少个单词。
+    """
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+
+    index = data.get('index')
+    step = data.get('step')
+    prefetch = data.get('prefetch', DEFAULT_PREFETCH)
+
+    if index is None and step is None:
+        return jsonify({'success': False, 'message': '请提供目标位置'}), 400
+    if not is_int(index if index is not None else step):
+        return jsonify({'success': False, 'message': '目标位置无效'}), 400
+    if not is_int(prefetch) or prefetch < 0:
+        return jsonify({'success': False, 'message': '预取数量无效'}), 400
+    prefetch = min(prefetch, MAX_PREFETCH)
+
+    content = get_wordbook_content(wordbook_id)
+    if content is None:
+        return jsonify({'success': False, 'message': '单词书不存在'}), 404
+    total_words = content.word_count
+
+    pending = pending_progress(user_id, wordbook_id).get(wordbook_id)
+
+    if index is None:
+        # 相对移动才需要读取当前位置
+        if pending:
+            current = pending[0]
+        else:
+            current = db.session.query(UserProgress.current_index).filter_by(
+                user_id=user_id,
+                wordbook_id=wordbook_id
+            ).scalar() or 1
+        index = min(max(current + step, 1), total_words)
+
+    if index < 1 or index > total_words:
+        return jsonify({'success': False, 'message': '索引超出范围'}), 400
+
+    # 目标单词和预取窗口来自单词书内容缓存，生词本标记来自成员集合
+    words = content.range(index, prefetch + 1)
+    if not words or words[0]['sequence'] != index:
+        return jsonify({'success': False, 'message': '单词不存在'}), 404
+
+    membership = get_membership(user_id)
+    for word in words:
+        word['is_in_vocabulary'] = word['id'] in membership
+
+    # 本接口直接写入进度，缓冲中的旧位置不再需要；校验全部通过后才丢弃，
+    # 请求被拒绝时缓冲的位置仍会照常写入
+    discard_progress(user_id, wordbook_id)
+
+    # 单条插入或更新语句，并发请求不会违反 unique_user_wordbook
+    db.session.execute(progress_upsert(), {
+        'user_id': user_id,
+        'wordbook_id': wordbook_id,
+        'current_index': index,
+        'last_learn_time': datetime.utcnow()
+    })
+    db.session.commit()
+
+    current_word = words[0]
+    current_word['total_words'] = total_words
+
+    percentage = round((index - 1) / total_words * 100, 1) if total_words > 0 else 0
+
+    return jsonify({
+        'success': True,
+        'current_index': index,
+        'total_words': total_words,
+        'progress_percentage': percentage,
+        'word': current_word,
+        'prefetch': words[1:]
+    })
@@ -4,6 +4,7 @@ from datetime import datetime
 from ..extensions import db
 from ..models.user_progress import UserProgress
 from ..models.wordbook import Wordbook
+from ..services.progress_buffer import record_progress, pending_progress, before_read, discard_progress
 
 progress_bp = Blueprint('progress', __name__)
 
@@ -15,15 +16,22 @@ def get_progress(wordbook_id):
     user_id = int(get_jwt_identity())
     
     wordbook = Wordbook.query.get(wordbook_id)
-    if not wordbook:
+    if not wordbook or wordbook.deleted_at:
         return jsonify({'success': False, 'message': '单词书不存在'}), 404
     
+    before_read()
     progress = UserProgress.query.filter_by(
         user_id=user_id,
         wordbook_id=wordbook_id
     ).first()
     
-    if not progress:
+    # 合并尚未写入数据库的最新位置
+    pending = pending_progress(user_id, wordbook_id).get(wordbook_id)
+    if pending:
+        current_index, last_learn_time = pending
+    elif progress:
+        current_index, last_learn_time = progress.current_index, progress.last_learn_time
+    else:
         # 如果没有进度记录，返回默认值
         return jsonify({
             'success': True,
@@ -36,16 +44,16 @@ def get_progress(wordbook_id):
             }
         })
     
-    percentage = round((progress.current_index - 1) / wordbook.word_count * 100, 1) if wordbook.word_count > 0 else 0
+    percentage = round((current_index - 1) / wordbook.word_count * 100, 1) if wordbook.word_count > 0 else 0
     
     return jsonify({
         'success': True,
         'progress': {
             'wordbook_id': wordbook_id,
-            'current_index': progress.current_index,
+            'current_index': current_index,
             'total_words': wordbook.word_count,
             'progress_percentage': percentage,
-            'last_learn_time': progress.last_learn_time.isoformat() if progress.last_learn_time else None
+            'last_learn_time': last_learn_time.isoformat() if last_learn_time else None
         }
     })
 
@@ -63,35 +71,19 @@ def update_progress(wordbook_id):
     current_index = data['current_index']
     
     wordbook = Wordbook.query.get(wordbook_id)
-    if not wordbook:
+    if not wordbook or wordbook.deleted_at:
         return jsonify({'success': False, 'message': '单词书不存在'}), 404
     
     # 验证索引范围
     if current_index < 1 or current_index > wordbook.word_count:
         return jsonify({'success': False, 'message': '索引超出范围'}), 400
     
-    progress = UserProgress.query.filter_by(
-        user_id=user_id,
-        wordbook_id=wordbook_id
-    ).first()
-    
-    if progress:
-        progress.current_index = current_index
-        progress.last_learn_time = datetime.utcnow()
-    else:
-        progress = UserProgress(
-            user_id=user_id,
-            wordbook_id=wordbook_id,
-            current_index=current_index,
-            last_learn_time=datetime.utcnow()
-        )
-        db.session.add(progress)
-    
-    db.session.commit()
+    # 连续翻卡时只在缓冲区中保留最新位置，批量写入数据库
+    record_progress(user_id, wordbook_id, current_index)
     
     return jsonify({
         'success': True,
-        'current_index': progress.current_index
+        'current_index': current_index
     })
 
 
@@ -101,14 +93,11 @@ def reset_progress(wordbook_id):
     """重置学习进度"""
     user_id = int(get_jwt_identity())
     
-    progress = UserProgress.query.filter_by(
+    discard_progress(user_id, wordbook_id)
+    UserProgress.query.filter_by(
         user_id=user_id,
         wordbook_id=wordbook_id
-    ).first()
-    
-    if progress:
-        progress.current_index = 1
-        progress.last_learn_time = datetime.utcnow()
-        db.session.commit()
+    ).update({'current_index': 1, 'last_learn_time': datetime.utcnow()})
+    db.session.commit()
     
     return jsonify({'success': True, 'current_index': 1})
@@ -0,0 +1,57 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..services.review_scheduler import next_due, grade_reviews
+from ..services.validation import is_valid_id
+
+review_bp = Blueprint('review', __name__)
+
+DEFAULT_BATCH = 20
+MAX_BATCH = 100
+# 一次评分请求最多包含的单词数
+MAX_GRADES = 500
+
+
+@review_bp.route('/next', methods=['GET'])
+@jwt_required()
+def get_next_reviews():
+    """获取最早到期的 n 个待复习单词"""
+    user_id = int(get_jwt_identity())
+    n = min(max(request.args.get('n', DEFAULT_BATCH, type=int), 1), MAX_BATCH)
+    
+    reviews = [
+        {**state, 'word': word}
+        for state, word in next_due(user_id, n)
+    ]
+    
+    return jsonify({'success': True, 'reviews': reviews, 'count': len(reviews)})
+
+
+@review_bp.route('/grade', methods=['POST'])
+@jwt_required()
+def grade():
+    """批量提交复习评分
+
+    请求体 {"grades": [{"word_id": 1, "quality": 4}, ...]}，quality 为 0-5：
+    0-2 表示没记住，3-5 表示记住了（数字越大越轻松）。
+    """
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    items = data.get('grades')
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'success': False, 'message': '请提供评分列表'}), 400
+    if len(items) > MAX_GRADES:
+        return jsonify({'success': False, 'message': f'一次最多提交 {MAX_GRADES} 个评分'}), 400
+    
+    grades = []
+    for item in items:
+        word_id = item.get('word_id') if isinstance(item, dict) else None
+        quality = item.get('quality') if isinstance(item, dict) else None
+        if not is_valid_id(word_id) or not isinstance(quality, int) or isinstance(quality, bool) \
+                or not 0 <= quality <= 5:
+            return jsonify({'success': False, 'message': '评分格式无效'}), 400
+        grades.append((word_id, quality))
+    
+    updated, not_found = grade_reviews(user_id, grades)
+    
+    return jsonify({'success': True, 'reviews': updated, 'not_found': not_found})
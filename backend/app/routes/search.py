@@ -0,0 +1,23 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from ..services.search_index import search
+
+search_bp = Blueprint('search', __name__)
+
+MAX_RESULTS = 50
+MAX_QUERY_LENGTH = 50
+
+
+@search_bp.route('', methods=['GET'])
+@jwt_required()
+def search_words():
+    """在所有已上架单词书中搜索单词
+
+    英文按单词前缀匹配，中文按释义包含匹配，结果按相关度排序。
+    """
+    query = request.args.get('q', '')[:MAX_QUERY_LENGTH]
+    limit = min(max(request.args.get('limit', 20, type=int), 1), MAX_RESULTS)
+    
+    results = search(query, limit)
+    
+    return jsonify({'success': True, 'query': query, 'results': results})
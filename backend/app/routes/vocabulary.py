@@ -1,29 +1,93 @@
+import base64
+from datetime import datetime
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import joinedload
 from ..extensions import db
 from ..models.vocabulary import Vocabulary
 from ..models.word import Word
+from ..models.wordbook import Wordbook
+from ..services.upsert import upsert, was_inserted
+from ..services.validation import is_valid_id
+from ..services.vocabulary_cache import get_total, get_membership, record_added, record_removed, invalidate_vocabulary
+from ..services.wordbook_cache import get_wordbook_content
 
 vocabulary_bp = Blueprint('vocabulary', __name__)
 
+MAX_PAGE_SIZE = 100
+# 批量接口一次最多处理的单词数
+MAX_BATCH_SIZE = 1000
+
+
+def _parse_word_ids(data):
+    """取出请求体中的 word_ids 并去重，格式错误返回 None"""
+    word_ids = data.get('word_ids') if data else None
+    if not isinstance(word_ids, list) or not word_ids:
+        return None
+    if not all(is_valid_id(word_id) for word_id in word_ids):
+        return None
+    return list(dict.fromkeys(word_ids))
+
+
+def _encode_cursor(item):
+    raw = f'{item.added_at.isoformat()}|{item.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor):
+    """解析游标，格式错误返回 None"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        added_at, vocabulary_id = raw.split('|')
+        return datetime.fromisoformat(added_at), int(vocabulary_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
 
 @vocabulary_bp.route('', methods=['GET'])
 @jwt_required()
 def get_vocabulary():
-    """获取用户的生词本"""
+    """获取用户的生词本
+
+    按加入时间倒序。传 cursor（上一页返回的 next_cursor）按 (added_at, id) 翻页，
+    不受页数深浅影响；仍兼容 page 参数的偏移分页。
+    总数来自缓存，游标分页时只在 with_total=1 时返回。
+    """
     user_id = int(get_jwt_identity())
     
-    page = request.args.get('page', 1, type=int)
-    limit = request.args.get('limit', 20, type=int)
+    cursor = request.args.get('cursor')
+    page = request.args.get('page', type=int)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), MAX_PAGE_SIZE)
     wordbook_id = request.args.get('wordbook_id', type=int)
+    with_total = page is not None or request.args.get('with_total') == '1'
     
-    query = Vocabulary.query.filter_by(user_id=user_id)
-    
+    query = Vocabulary.query.filter(Vocabulary.user_id == user_id)
     if wordbook_id:
-        query = query.join(Word).filter(Word.wordbook_id == wordbook_id)
+        query = query.join(Word, Word.id == Vocabulary.word_id).filter(Word.wordbook_id == wordbook_id)
+    
+    total = get_total(user_id, wordbook_id, query.count) if with_total else None
     
-    total = query.count()
-    vocabulary_items = query.order_by(Vocabulary.added_at.desc()).offset((page - 1) * limit).limit(limit).all()
+    # 一次查询带出单词和所属单词书，序列化时不再逐行懒加载
+    items_query = query.options(
+        joinedload(Vocabulary.word).joinedload(Word.wordbook)
+    ).order_by(Vocabulary.added_at.desc(), Vocabulary.id.desc())
+    
+    if cursor:
+        position = _decode_cursor(cursor)
+        if position is None:
+            return jsonify({'success': False, 'message': '分页游标无效'}), 400
+        added_at, vocabulary_id = position
+        items_query = items_query.filter(db.or_(
+            Vocabulary.added_at < added_at,
+            db.and_(Vocabulary.added_at == added_at, Vocabulary.id < vocabulary_id)
+        ))
+    elif page and page > 1:
+        items_query = items_query.offset((page - 1) * limit)
+    
+    # 多取一条判断是否还有下一页
+    vocabulary_items = items_query.limit(limit + 1).all()
+    has_more = len(vocabulary_items) > limit
+    vocabulary_items = vocabulary_items[:limit]
     
     result = []
     for item in vocabulary_items:
@@ -36,11 +100,31 @@ def get_vocabulary():
         'success': True,
         'vocabulary': result,
         'total': total,
-        'page': page,
-        'limit': limit
+        'page': page or 1,
+        'limit': limit,
+        'next_cursor': _encode_cursor(vocabulary_items[-1]) if has_more else None
     })
 
 
+@vocabulary_bp.route('/word-ids', methods=['GET'])
+@jwt_required()
+def get_vocabulary_word_ids():
+    """获取生词本中的单词ID列表，可按单词书过滤（配合单词书快照使用）"""
+    user_id = int(get_jwt_identity())
+    wordbook_id = request.args.get('wordbook_id', type=int)
+    
+    membership = get_membership(user_id)
+    if not wordbook_id:
+        return jsonify({'success': True, 'word_ids': list(membership.ids)})
+    
+    content = get_wordbook_content(wordbook_id)
+    if content is None:
+        return jsonify({'success': False, 'message': '单词书不存在'}), 404
+    
+    word_ids = [word_id for word_id in content.ids if word_id in membership]
+    return jsonify({'success': True, 'word_ids': word_ids})
+
+
 @vocabulary_bp.route('', methods=['POST'])
 @jwt_required()
 def add_to_vocabulary():
@@ -52,22 +136,28 @@ def add_to_vocabulary():
         return jsonify({'success': False, 'message': '请提供单词ID'}), 400
     
     word_id = data['word_id']
+    if not is_valid_id(word_id):
+        return jsonify({'success': False, 'message': '单词ID无效'}), 400
     
-    # 检查单词是否存在
-    word = Word.query.get(word_id)
+    # 检查单词是否存在（已删除、等待清理的单词书中的单词视为不存在）
+    word = Word.query.join(Wordbook, Wordbook.id == Word.wordbook_id).filter(
+        Word.id == word_id, Wordbook.deleted_at.is_(None)
+    ).first()
     if not word:
         return jsonify({'success': False, 'message': '单词不存在'}), 404
     
-    # 检查是否已在生词本中
-    existing = Vocabulary.query.filter_by(user_id=user_id, word_id=word_id).first()
-    if existing:
-        return jsonify({'success': True, 'message': '该单词已在生词本中'})
-    
-    vocabulary = Vocabulary(user_id=user_id, word_id=word_id)
-    db.session.add(vocabulary)
+    # 单条语句插入，已在生词本中时不做修改（并发添加同一单词也不会违反唯一约束）
+    result = db.session.execute(
+        upsert(Vocabulary.__table__, ['user_id', 'word_id']),
+        {'user_id': user_id, 'word_id': word_id}
+    )
     db.session.commit()
     
-    return jsonify({'success': True, 'message': '已加入生词本', 'id': vocabulary.id}), 201
+    if not was_inserted(result):
+        return jsonify({'success': True, 'message': '该单词已在生词本中'})
+    record_added(user_id, [word_id])
+    
+    return jsonify({'success': True, 'message': '已加入生词本', 'id': result.inserted_primary_key[0]}), 201
 
 
 @vocabulary_bp.route('/<int:vocabulary_id>', methods=['DELETE'])
@@ -80,8 +170,10 @@ def remove_from_vocabulary(vocabulary_id):
     if not vocabulary:
         return jsonify({'success': False, 'message': '记录不存在'}), 404
     
+    word_id = vocabulary.word_id
     db.session.delete(vocabulary)
     db.session.commit()
+    record_removed(user_id, [word_id])
     
     return jsonify({'success': True, 'message': '已从生词本移除'})
 
@@ -92,11 +184,93 @@ def remove_word_from_vocabulary(word_id):
     """通过单词ID从生词本移除"""
     user_id = int(get_jwt_identity())
     
-    vocabulary = Vocabulary.query.filter_by(word_id=word_id, user_id=user_id).first()
-    if not vocabulary:
+    removed = Vocabulary.query.filter_by(word_id=word_id, user_id=user_id).delete(synchronize_session=False)
+    db.session.commit()
+    if not removed:
         return jsonify({'success': False, 'message': '该单词不在生词本中'}), 404
+    record_removed(user_id, [word_id])
     
-    db.session.delete(vocabulary)
+    return jsonify({'success': True, 'message': '已从生词本移除'})
+
+
+@vocabulary_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def add_many_to_vocabulary():
+    """批量添加单词到生词本
+
+    请求体 {"word_ids": [...]}。一次查询校验单词并找出已在生词本中的，
+    再用一条批量语句插入其余单词。
+    """
+    user_id = int(get_jwt_identity())
+    word_ids = _parse_word_ids(request.get_json(silent=True))
+    
+    if word_ids is None:
+        return jsonify({'success': False, 'message': '请提供单词ID列表'}), 400
+    if len(word_ids) > MAX_BATCH_SIZE:
+        return jsonify({'success': False, 'message': f'一次最多处理 {MAX_BATCH_SIZE} 个单词'}), 400
+    
+    rows = db.session.query(Word.id, Vocabulary.id).outerjoin(
+        Vocabulary,
+        db.and_(Vocabulary.word_id == Word.id, Vocabulary.user_id == user_id)
+    ).join(
+        Wordbook, Wordbook.id == Word.wordbook_id
+    ).filter(Word.id.in_(word_ids), Wordbook.deleted_at.is_(None)).all()
+    
+    found = {word_id for word_id, _ in rows}
+    new_ids = [word_id for word_id, vocabulary_id in rows if vocabulary_id is None]
+    
+    if new_ids:
+        # 冲突时忽略，并发添加同一单词不会失败
+        db.session.execute(
+            upsert(Vocabulary.__table__, ['user_id', 'word_id']),
+            [{'user_id': user_id, 'word_id': word_id} for word_id in new_ids]
+        )
+        db.session.commit()
+        record_added(user_id, new_ids)
+    
+    return jsonify({
+        'success': True,
+        'message': f'已加入 {len(new_ids)} 个单词',
+        'added': len(new_ids),
+        'existing': len(found) - len(new_ids),
+        'not_found': [word_id for word_id in word_ids if word_id not in found]
+    })
+
+
+@vocabulary_bp.route('/batch/delete', methods=['POST'])
+@jwt_required()
+def remove_many_from_vocabulary():
+    """批量从生词本移除
+
+    请求体 {"word_ids": [...]} 移除指定单词，或 {"wordbook_id": n} 清空该单词书的全部生词，
+    都只执行一条 DELETE 语句。
+    """
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    
+    query = Vocabulary.query.filter(Vocabulary.user_id == user_id)
+    
+    word_ids = None
+    if 'wordbook_id' in data:
+        wordbook_id = data['wordbook_id']
+        if not is_valid_id(wordbook_id):
+            return jsonify({'success': False, 'message': '单词书ID无效'}), 400
+        wordbook_words = db.session.query(Word.id).filter(Word.wordbook_id == wordbook_id)
+        query = query.filter(Vocabulary.word_id.in_(wordbook_words.scalar_subquery()))
+    else:
+        word_ids = _parse_word_ids(data)
+        if word_ids is None:
+            return jsonify({'success': False, 'message': '请提供单词ID列表或单词书ID'}), 400
+        if len(word_ids) > MAX_BATCH_SIZE:
+            return jsonify({'success': False, 'message': f'一次最多处理 {MAX_BATCH_SIZE} 个单词'}), 400
+        query = query.filter(Vocabulary.word_id.in_(word_ids))
+    
+    removed = query.delete(synchronize_session=False)
     db.session.commit()
+    if removed:
+        if word_ids is None:
+            invalidate_vocabulary(user_id)
+        else:
+            record_removed(user_id, word_ids)
     
-    return jsonify({'success': True, 'message': '已从生词本移除'})
+    return jsonify({'success': True, 'message': f'已移除 {removed} 个单词', 'removed': removed})
@@ -3,10 +3,29 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..extensions import db
 from ..models.wordbook import Wordbook
 from ..models.user_progress import UserProgress
+from ..services.catalog_cache import get_catalog, set_catalog, current_generation
+from ..services.wordbook_cache import peek_version
+from ..services.http_cache import make_etag, not_modified, with_cache_headers
+from ..services.progress_buffer import pending_progress, before_read
 
 wordbooks_bp = Blueprint('wordbooks', __name__)
 
 
+def _progress_dict(progress, pending=None):
+    if pending:
+        current_index, last_learn_time = pending
+        return {
+            'current_index': current_index,
+            'last_learn_time': last_learn_time.isoformat()
+        }
+    if not progress:
+        return None
+    return {
+        'current_index': progress.current_index,
+        'last_learn_time': progress.last_learn_time.isoformat() if progress.last_learn_time else None
+    }
+
+
 @wordbooks_bp.route('', methods=['GET'])
 @jwt_required()
 def get_wordbooks():
@@ -14,27 +33,32 @@ def get_wordbooks():
     try:
         user_id = int(get_jwt_identity())
         
-        # 只获取已上架的词库
-        wordbooks = Wordbook.query.filter_by(is_active=True).all()
+        before_read()
+        catalog = get_catalog()
+        if catalog is None:
+            # 目录未缓存：一次外连接同时取出已上架词库和用户进度
+            generation = current_generation()
+            rows = db.session.query(Wordbook, UserProgress).outerjoin(
+                UserProgress,
+                db.and_(UserProgress.wordbook_id == Wordbook.id, UserProgress.user_id == user_id)
+            ).filter(Wordbook.is_active == True).order_by(Wordbook.id).all()
+            
+            catalog = [wb.to_dict() for wb, _ in rows]
+            set_catalog(catalog, generation)
+            progress_map = {wb.id: progress for wb, progress in rows}
+        else:
+            # 目录已缓存：只查询该用户的进度
+            progress_map = {
+                progress.wordbook_id: progress
+                for progress in UserProgress.query.filter_by(user_id=user_id).all()
+            }
+        
+        pending = pending_progress(user_id)
         
         result = []
-        for wb in wordbooks:
-            wb_dict = wb.to_dict()
-            
-            # 获取用户学习进度
-            progress = UserProgress.query.filter_by(
-                user_id=user_id, 
-                wordbook_id=wb.id
-            ).first()
-            
-            if progress:
-                wb_dict['user_progress'] = {
-                    'current_index': progress.current_index,
-                    'last_learn_time': progress.last_learn_time.isoformat() if progress.last_learn_time else None
-                }
-            else:
-                wb_dict['user_progress'] = None
-            
+        for wb_dict in catalog:
+            wb_dict = dict(wb_dict)
+            wb_dict['user_progress'] = _progress_dict(progress_map.get(wb_dict['id']), pending.get(wb_dict['id']))
             result.append(wb_dict)
         
         return jsonify({'success': True, 'wordbooks': result})
@@ -48,8 +72,22 @@ def get_wordbooks():
 @jwt_required()
 def get_wordbook(wordbook_id):
     """获取单词书详情"""
+    cache_control = 'private, no-cache'
+    
+    # 本进程缓存了版本号时，无需查询数据库即可判断是否未修改
+    version = peek_version(wordbook_id)
+    if version is not None:
+        response = not_modified(make_etag('b', wordbook_id, version), cache_control)
+        if response:
+            return response
+    
     wordbook = Wordbook.query.get(wordbook_id)
-    if not wordbook:
+    if not wordbook or wordbook.deleted_at:
         return jsonify({'success': False, 'message': '单词书不存在'}), 404
     
-    return jsonify({'success': True, 'wordbook': wordbook.to_dict()})
+    etag = make_etag('b', wordbook_id, wordbook.version)
+    response = not_modified(etag, cache_control)
+    if response:
+        return response
+    
+    return with_cache_headers(jsonify({'success': True, 'wordbook': wordbook.to_dict()}), etag, cache_control)
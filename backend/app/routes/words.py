@@ -1,8 +1,11 @@
-from flask import Blueprint, jsonify
+import gzip
+from flask import Blueprint, jsonify, request, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from ..models.word import Word
-from ..models.wordbook import Wordbook
-from ..models.vocabulary import Vocabulary
+from ..config import Config
+from ..services.wordbook_cache import get_wordbook_content
+from ..services.http_cache import make_etag, not_modified, with_cache_headers
+from ..services.snapshot import get_snapshot, SNAPSHOT_FORMAT
+from ..services.vocabulary_cache import get_membership
 
 words_bp = Blueprint('words', __name__)
 
@@ -13,52 +16,93 @@ def get_word(wordbook_id, sequence):
     """获取指定单词书中指定位置的单词"""
     user_id = int(get_jwt_identity())
     
-    wordbook = Wordbook.query.get(wordbook_id)
-    if not wordbook:
+    content = get_wordbook_content(wordbook_id)
+    if content is None:
         return jsonify({'success': False, 'message': '单词书不存在'}), 404
     
-    word = Word.query.filter_by(
-        wordbook_id=wordbook_id,
-        sort_order=sequence
-    ).first()
-    
-    if not word:
+    result = content.get(sequence)
+    if not result:
         return jsonify({'success': False, 'message': '单词不存在'}), 404
     
     # 检查是否在生词本中
-    is_in_vocabulary = Vocabulary.query.filter_by(
-        user_id=user_id,
-        word_id=word.id
-    ).first() is not None
+    is_in_vocabulary = result['id'] in get_membership(user_id)
+    
+    # 响应包含用户自己的生词本标记，只允许浏览器缓存
+    etag = make_etag('w', wordbook_id, content.version, sequence, int(is_in_vocabulary))
+    cache_control = 'private, no-cache'
+    response = not_modified(etag, cache_control)
+    if response:
+        return response
     
-    result = word.to_dict()
     result['is_in_vocabulary'] = is_in_vocabulary
-    result['total_words'] = wordbook.word_count
+    result['total_words'] = content.word_count
     
-    return jsonify({'success': True, 'word': result})
+    return with_cache_headers(jsonify({'success': True, 'word': result}), etag, cache_control)
 
 
 @words_bp.route('/batch/<int:wordbook_id>', methods=['GET'])
 @jwt_required()
 def get_words_batch(wordbook_id):
-    """批量获取单词（用于预加载）"""
-    from flask import request
-    
+    """批量获取单词（用于预加载）
+
+    传 flags=1 时为每个单词附带 is_in_vocabulary，响应因用户而异，不再允许共享缓存。
+    """
     start = request.args.get('start', 1, type=int)
     limit = request.args.get('limit', 10, type=int)
+    with_flags = request.args.get('flags') == '1'
     
-    wordbook = Wordbook.query.get(wordbook_id)
-    if not wordbook:
+    content = get_wordbook_content(wordbook_id)
+    if content is None:
         return jsonify({'success': False, 'message': '单词书不存在'}), 404
     
-    words = Word.query.filter(
-        Word.wordbook_id == wordbook_id,
-        Word.sort_order >= start,
-        Word.sort_order < start + limit
-    ).order_by(Word.sort_order).all()
+    words = content.range(start, limit)
+    
+    if with_flags:
+        flags = get_membership(int(get_jwt_identity())).flags([word['id'] for word in words])
+        for word, flag in zip(words, flags):
+            word['is_in_vocabulary'] = flag
+        # 生词本标记压成位图放进 ETag，标记变化时缓存失效
+        bitmap = sum(1 << i for i, flag in enumerate(flags) if flag)
+        etag = make_etag('wbf', wordbook_id, content.version, start, limit, format(bitmap, 'x'))
+        cache_control = 'private, no-cache'
+    else:
+        # 同一版本同一范围的内容不会变化，且与用户无关，允许 nginx 等共享缓存保存
+        etag = make_etag('wb', wordbook_id, content.version, start, limit)
+        cache_control = f'public, max-age={Config.WORD_BATCH_MAX_AGE}'
+    
+    response = not_modified(etag, cache_control)
+    if response:
+        return response
     
-    return jsonify({
+    response = jsonify({
         'success': True,
-        'words': [w.to_dict() for w in words],
-        'total': wordbook.word_count
+        'words': words,
+        'total': content.word_count
     })
+    return with_cache_headers(response, etag, cache_control)
+
+
+@words_bp.route('/snapshot/<int:wordbook_id>', methods=['GET'])
+@jwt_required()
+def get_wordbook_snapshot(wordbook_id):
+    """获取整本单词书的压缩快照（用于离线学习）"""
+    snapshot = get_snapshot(wordbook_id)
+    if not snapshot:
+        return jsonify({'success': False, 'message': '单词书不存在'}), 404
+    
+    version, data = snapshot
+    etag = make_etag('s', wordbook_id, version, SNAPSHOT_FORMAT)
+    cache_control = 'private, no-cache'
+    response = not_modified(etag, cache_control)
+    if response:
+        return response
+    
+    # 快照以 gzip 形式保存，客户端支持时原样返回
+    if 'gzip' in request.accept_encodings:
+        response = make_response(data)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = make_response(gzip.decompress(data))
+    response.mimetype = 'application/json'
+    response.vary.add('Accept-Encoding')
+    return with_cache_headers(response, etag, cache_control)
@@ -1,5 +1,12 @@
+import io
 import pdfplumber
+import logging
+import multiprocessing
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
 
 PATTERN_VOCAB = re.compile(
     r'([a-zA-Z\s\-\.]+?)\s*\[([^\]]+)\]\s*(.+)',
@@ -8,48 +15,111 @@ PATTERN_VOCAB = re.compile(
 
 PATTERN_HEADER = re.compile(r'Vocabulary List|Word|Meaning|N0\.|中英词表|雅思词汇真经', re.IGNORECASE)
 
-def extract_words_from_pdf(pdf_path):
+# 少于该页数时并行的进程开销大于收益，直接串行
+MIN_PAGES_PER_WORKER = 2
+
+# 解析在后台导入线程中发起，多线程进程中 fork 不安全，子进程改用 spawn 启动
+_MP_CONTEXT = multiprocessing.get_context('spawn')
+
+
+def _parse_pair(word_phonetic, meaning, words):
+    meaning = meaning.replace('\n', ' ').strip()
+
+    match = PATTERN_VOCAB.search(word_phonetic)
+    if match:
+        word = match.group(1).strip()
+        phonetic = match.group(2).strip()
+        words.append((word, phonetic, meaning))
+    else:
+        word = word_phonetic.strip()
+        if word:
+            words.append((word, '', meaning))
+
+
+def _extract_page_words(page):
+    words = []
+    for table in page.extract_tables():
+        for row in table:
+            if not row or all(cell is None or (isinstance(cell, str) and cell.strip() == '') for cell in row):
+                continue
+            cols = [cell.strip() if cell else '' for cell in row]
+
+            row_text = ' '.join(cols)
+            if PATTERN_HEADER.search(row_text):
+                continue
+
+            if len(cols) >= 3 and cols[1] and cols[2]:
+                _parse_pair(cols[1], cols[2], words)
+
+            if len(cols) >= 6 and cols[4] and cols[5]:
+                _parse_pair(cols[4], cols[5], words)
+    return words
+
+
+def _open_pdf(source):
+    if isinstance(source, bytes):
+        return pdfplumber.open(io.BytesIO(source))
+    return pdfplumber.open(source)
+
+
+def _extract_page_range(source, start, end):
+    """在子进程中解析 [start, end) 页，source 为文件路径或 PDF 字节"""
     words = []
-    
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            tables = page.extract_tables()
-            for table in tables:
-                for row in table:
-                    if not row or all(cell is None or (isinstance(cell, str) and cell.strip() == '') for cell in row):
-                        continue
-                    cols = [cell.strip() if cell else '' for cell in row]
-                    
-                    row_text = ' '.join(cols)
-                    if PATTERN_HEADER.search(row_text):
-                        continue
-                    
-                    if len(cols) >= 3 and cols[1] and cols[2]:
-                        word_phonetic = cols[1]
-                        meaning = cols[2].replace('\n', ' ').strip()
-                        
-                        match = PATTERN_VOCAB.search(word_phonetic)
-                        if match:
-                            word = match.group(1).strip()
-                            phonetic = match.group(2).strip()
-                            words.append((word, phonetic, meaning))
-                        else:
-                            word = word_phonetic.strip()
-                            if word:
-                                words.append((word, '', meaning))
-                    
-                    if len(cols) >= 6 and cols[4] and cols[5]:
-                        word_phonetic = cols[4]
-                        meaning = cols[5].replace('\n', ' ').strip()
-                        
-                        match = PATTERN_VOCAB.search(word_phonetic)
-                        if match:
-                            word = match.group(1).strip()
-                            phonetic = match.group(2).strip()
-                            words.append((word, phonetic, meaning))
-                        else:
-                            word = word_phonetic.strip()
-                            if word:
-                                words.append((word, '', meaning))
-    
+    with _open_pdf(source) as pdf:
+        for page in pdf.pages[start:end]:
+            words.extend(_extract_page_words(page))
+            page.flush_cache()
     return words
+
+
+def _split_pages(page_count, workers):
+    """把页码切成 workers 段连续区间"""
+    size, extra = divmod(page_count, workers)
+    ranges = []
+    start = 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def extract_words_from_pdf(source, workers=1):
+    """解析 PDF 中的词表，返回 (word, phonetic, translation) 列表
+
+    source 可以是文件路径、字节串或可 seek 的文件对象（如上传缓冲区）。
+    workers > 1 时把页码区间分给进程池并行解析，按页序合并，结果与串行完全一致。
+    """
+    if hasattr(source, 'read'):
+        source.seek(0)
+
+    with _open_pdf(source) as pdf:
+        page_count = len(pdf.pages)
+        workers = min(workers or 1, page_count // MIN_PAGES_PER_WORKER)
+
+        if workers <= 1:
+            words = []
+            for page in pdf.pages:
+                words.extend(_extract_page_words(page))
+            return words
+
+    # 子进程无法共享文件对象，改为传 PDF 字节
+    if hasattr(source, 'read'):
+        source.seek(0)
+        source = source.read()
+
+    ranges = _split_pages(page_count, workers)
+    logger.info(f'并行解析 PDF: {page_count} 页，{len(ranges)} 个进程')
+
+    try:
+        with ProcessPoolExecutor(max_workers=len(ranges), mp_context=_MP_CONTEXT) as executor:
+            futures = [executor.submit(_extract_page_range, source, start, end) for start, end in ranges]
+            words = []
+            for future in futures:
+                words.extend(future.result())
+            return words
+    except (OSError, NotImplementedError, BrokenProcessPool) as e:
+        # 部分 Serverless 环境不支持多进程，或子进程崩溃（如内存不足被杀），退回串行
+        logger.warning(f'进程池不可用，改为串行解析: {e}')
+        return extract_words_from_pdf(source, workers=1)
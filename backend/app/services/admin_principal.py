@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from ..config import Config
+from ..extensions import db
+from ..models.user import User
+
+# 管理后台每个页面和接口都要确认当前用户仍是管理员，/api 接口也要确认用户未被删除。
+# 按令牌 jti 缓存 ADMIN_PRINCIPAL_TTL 秒，期间不再查询 users 表；
+# 本进程删除用户或取消管理员权限时立即失效，其他进程最多滞后 TTL 秒。
+Principal = namedtuple('Principal', ['user_id', 'is_admin', 'is_super_admin'])
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # jti -> (Principal 或 None, 缓存时间)，按最近使用排序
+_hits = 0
+_misses = 0
+_invalidations = 0
+
+
+def resolve_principal(decoded):
+    """根据已验证的令牌返回 Principal，用户不存在或已删除时返回 None"""
+    global _hits, _misses
+    jti = decoded['jti']
+    now = time.monotonic()
+    with _lock:
+        cached = _entries.get(jti)
+        if cached and now - cached[1] < Config.ADMIN_PRINCIPAL_TTL:
+            _entries.move_to_end(jti)
+            _hits += 1
+            return cached[0]
+        _misses += 1
+
+    row = db.session.query(User.id, User.is_admin, User.is_super_admin).filter(
+        User.id == int(decoded['sub']), User.deleted_at.is_(None)
+    ).first()
+    principal = Principal(row.id, bool(row.is_admin), bool(row.is_super_admin)) if row else None
+
+    with _lock:
+        _entries[jti] = (principal, now)
+        _entries.move_to_end(jti)
+        while len(_entries) > Config.ADMIN_PRINCIPAL_MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return principal
+
+
+def invalidate_principal(user_id):
+    """删除用户或修改其管理员权限并提交后调用"""
+    global _invalidations
+    with _lock:
+        for jti in [jti for jti, (principal, _) in _entries.items() if principal and principal.user_id == user_id]:
+            del _entries[jti]
+            _invalidations += 1
+
+
+def principal_cache_stats():
+    with _lock:
+        lookups = _hits + _misses
+        return {
+            'hits': _hits,
+            'misses': _misses,
+            'hit_rate': round(_hits / lookups, 3) if lookups else None,
+            'invalidations': _invalidations,
+            'entries': len(_entries),
+            'ttl': Config.ADMIN_PRINCIPAL_TTL,
+            'max_entries': Config.ADMIN_PRINCIPAL_MAX_ENTRIES
+        }
@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+from flask import current_app
+from ..config import Config
+from ..extensions import db
+from ..models.user import User
+from ..models.wordbook import Wordbook
+
+logger = logging.getLogger(__name__)
+
+# 管理后台首页的统计数字
+# 本进程内的导入、删除、上下架、注册等操作直接增减计数；
+# 超过 ADMIN_STATS_TTL 秒后在后台线程重新统计，纠正其他进程造成的偏差
+_lock = threading.Lock()
+_stats = None
+_counted_at = 0.0
+_refreshing = False
+
+
+def _count():
+    """两条小表聚合查询，单词总数取各单词书 word_count 之和，不扫描 words 表"""
+    wordbooks, active, words = db.session.query(
+        db.func.count(Wordbook.id),
+        db.func.sum(db.case((Wordbook.is_active == True, 1), else_=0)),
+        db.func.sum(Wordbook.word_count)
+    ).filter(Wordbook.deleted_at.is_(None)).one()
+    users = db.session.query(db.func.count(User.id)).filter(User.deleted_at.is_(None)).scalar()
+    return {
+        'total_wordbooks': wordbooks,
+        'active_wordbooks': int(active or 0),
+        'total_words': int(words or 0),
+        'total_users': users
+    }
+
+
+def _store(stats):
+    global _stats, _counted_at
+    with _lock:
+        _stats = stats
+        _counted_at = time.monotonic()
+
+
+def _refresh_in_background(app):
+    global _refreshing
+    try:
+        with app.app_context():
+            _store(_count())
+            db.session.remove()
+    except Exception as e:
+        logger.error(f'重新统计后台数据失败: {e}', exc_info=True)
+    finally:
+        with _lock:
+            _refreshing = False
+
+
+def get_dashboard_stats():
+    """返回统计快照
+
+    首次调用时同步统计；之后总是立即返回缓存，过期时在后台线程重新统计。
+    """
+    global _refreshing
+    with _lock:
+        stats = _stats
+        stale = stats is not None and time.monotonic() - _counted_at > Config.ADMIN_STATS_TTL
+        start_refresh = stale and not _refreshing
+        if start_refresh:
+            _refreshing = True
+
+    if stats is None:
+        stats = _count()
+        _store(stats)
+        return dict(stats)
+
+    if start_refresh:
+        threading.Thread(
+            target=_refresh_in_background,
+            args=(current_app._get_current_object(),),
+            name='admin-stats',
+            daemon=True
+        ).start()
+    return dict(stats)
+
+
+def adjust_stats(**deltas):
+    """提交修改后调用，增减缓存中的计数，如 adjust_stats(total_wordbooks=1, total_words=500)
+
+    尚未统计过时不做任何事，下次读取时会完整统计。
+    """
+    with _lock:
+        if _stats is None:
+            return
+        for key, delta in deltas.items():
+            _stats[key] += delta
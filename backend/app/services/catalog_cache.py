@@ -0,0 +1,41 @@
+import threading
+import time
+from ..config import Config
+
+# 已上架单词书目录的进程内缓存
+# 管理员上架/下架、导入、删除、加词时调用 invalidate_catalog() 立即失效；
+# 多进程部署时其他进程的缓存最多滞后 CATALOG_CACHE_TTL 秒
+_lock = threading.Lock()
+_catalog = None
+_loaded_at = 0.0
+_generation = 0
+
+
+def get_catalog():
+    """返回缓存的目录（单词书字典列表），未缓存或已过期返回 None"""
+    with _lock:
+        if _catalog is None or time.monotonic() - _loaded_at > Config.CATALOG_CACHE_TTL:
+            return None
+        return _catalog
+
+
+def current_generation():
+    """在查询数据库之前取得代号，写回缓存时用来丢弃查询期间被失效的结果"""
+    with _lock:
+        return _generation
+
+
+def set_catalog(catalog, generation):
+    global _catalog, _loaded_at
+    with _lock:
+        if generation != _generation:
+            return
+        _catalog = catalog
+        _loaded_at = time.monotonic()
+
+
+def invalidate_catalog():
+    global _catalog, _generation
+    with _lock:
+        _catalog = None
+        _generation += 1
@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+from ..config import Config
+from ..models.study_event import StudyEvent
+from .write_behind import RetryCounter, start_flusher, write_rows
+
+logger = logging.getLogger(__name__)
+
+# 尚未写入数据库的学习事件（StudyEvent 列名到值的字典）
+_lock = threading.Lock()
+_pending = []
+_last_flush = time.monotonic()
+
+_flush_lock = threading.Lock()
+_flusher = None
+
+
+def record_events(events):
+    """缓冲一批学习事件，按时间间隔或数量批量写入数据库
+
+    STUDY_EVENT_WRITE_BEHIND 关闭时立即写入。
+    """
+    with _lock:
+        _pending.extend(events)
+        # 数据库长时间不可用时只保留最新的事件，避免占满内存
+        overflow = len(_pending) - Config.STUDY_EVENT_BUFFER_MAX
+        if overflow > 0:
+            del _pending[:overflow]
+            logger.warning(f'学习事件缓冲已满，丢弃 {overflow} 条最早的事件')
+        due = (
+            not Config.STUDY_EVENT_WRITE_BEHIND
+            or len(_pending) >= Config.STUDY_EVENT_FLUSH_SIZE
+            or time.monotonic() - _last_flush >= Config.STUDY_EVENT_FLUSH_INTERVAL
+        )
+    if due:
+        flush_events()
+
+
+def discard_events(user_id):
+    """丢弃缓冲中该用户的事件，删除用户时调用"""
+    with _lock:
+        _pending[:] = [event for event in _pending if event['user_id'] != user_id]
+
+
+def _event_key(event):
+    return event['user_id'], event['word_id'], event['action'], event['occurred_at']
+
+
+_retries = RetryCounter(_event_key, '学习事件')
+
+
+def _write(conn, events):
+    conn.execute(StudyEvent.__table__.insert(), events)
+
+
+def flush_events():
+    """把缓冲的事件写入数据库，返回写入的条数
+
+    用独立连接一次批量插入，不影响当前请求的会话。无法写入的事件只丢弃这一条，
+    数据库暂时不可用时放回缓冲（每条最多重试 MAX_ROW_ATTEMPTS 次）。
+    """
+    global _last_flush
+    with _flush_lock:
+        with _lock:
+            events = _pending[:]
+            _pending.clear()
+            _last_flush = time.monotonic()
+        if not events:
+            return 0
+
+        written, retry = write_rows(_write, events, '学习事件')
+        retry_ids = {id(event) for event in retry}
+        _retries.forget([event for event in events if id(event) not in retry_ids])
+
+        retry = _retries.requeue(retry)
+        if retry:
+            with _lock:
+                _pending[:0] = retry
+        return written
+
+
+def init_event_buffer(app):
+    """启动定时写入线程并注册退出时写入，在 create_app 中调用"""
+    global _flusher
+    if _flusher is not None or not Config.STUDY_EVENT_WRITE_BEHIND:
+        return
+
+    _flusher = start_flusher(
+        app, 'study-event-flush',
+        lambda: Config.STUDY_EVENT_FLUSH_INTERVAL,
+        lambda: bool(_pending),
+        flush_events
+    )
@@ -4,82 +4,93 @@ import re
 
 logger = logging.getLogger(__name__)
 
-def parse_excel(excel_path):
-    word_dict = {}
+PATTERN_PHONETIC = re.compile(r'\[([^\]]+)\]')
+
+
+def _split_phonetic(word_str):
+    """从 "word [phonetic]" 中拆出单词和音标"""
+    phonetic_match = PATTERN_PHONETIC.search(word_str)
+    if phonetic_match:
+        word = word_str.replace(phonetic_match.group(0), '').strip()
+        return word, phonetic_match.group(1).strip()
+    return word_str, ''
+
+
+def iter_excel_words(excel_path):
+    """单次遍历工作表，逐行生成 (serial, word, phonetic, translation)
+
+    excel_path 可以是文件路径或可 seek 的文件对象（如上传缓冲区）。
+    3 列：序号、英文、中文；2 列：英文、中文（没有序号，用行号当序号）。
+    只读模式下按顺序流式读取 sheet XML，不会重复扫描。
+    """
+    if hasattr(excel_path, 'read'):
+        excel_path.seek(0)
+
+    workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
     try:
-        workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
         sheet = workbook.active
-        
-        logger.info(f'解析Excel: {sheet.title}, {sheet.max_row}行, {sheet.max_column}列')
-        
-        for row_idx in range(1, sheet.max_row + 1):
+        logger.info(f'解析Excel: {sheet.title}')
+
+        for row_idx, row in enumerate(sheet.iter_rows(values_only=True), 1):
             try:
-                row = list(sheet.iter_rows(min_row=row_idx, max_row=row_idx, values_only=True))[0]
-                
-                cells = []
-                for cell in row:
-                    if cell is None:
-                        cells.append('')
-                    else:
-                        cells.append(str(cell).strip())
-                
-                # 处理 Excel 读取
+                cells = ['' if cell is None else str(cell).strip() for cell in row]
+
                 if len(cells) >= 3:
-                    # 3 列：序号、英文、中文
-                    serial = cells[0]
-                    word_str = cells[1]
-                    meaning_str = cells[2]
-                    
-                    if serial and serial.isdigit() and word_str and meaning_str:
-                        serial_num = int(serial)
-                        
-                        word = ''
-                        phonetic = ''
-                        phonetic_match = re.search(r'\[([^\]]+)\]', word_str)
-                        if phonetic_match:
-                            word = word_str.replace(phonetic_match.group(0), '').strip()
-                            phonetic = phonetic_match.group(1).strip()
-                        else:
-                            word = word_str
-                        
-                        if word and serial_num not in word_dict:
-                            word_dict[serial_num] = (word, phonetic, meaning_str)
+                    serial, word_str, meaning_str = cells[0], cells[1], cells[2]
+                    if not (serial and serial.isdigit() and word_str and meaning_str):
+                        continue
+                    serial_num = int(serial)
+                    # 与原解析器一致，序号从 1 开始，序号为 0 的行丢弃
+                    if serial_num < 1:
+                        continue
                 elif len(cells) >= 2:
-                    # 2 列：英文、中文（没有序号，用行号当序号）
-                    word_str = cells[0]
-                    meaning_str = cells[1]
-                    
-                    if word_str and meaning_str:
-                        serial_num = row_idx
-                        
-                        word = ''
-                        phonetic = ''
-                        phonetic_match = re.search(r'\[([^\]]+)\]', word_str)
-                        if phonetic_match:
-                            word = word_str.replace(phonetic_match.group(0), '').strip()
-                            phonetic = phonetic_match.group(1).strip()
-                        else:
-                            word = word_str
-                        
-                        if word and serial_num not in word_dict:
-                            word_dict[serial_num] = (word, phonetic, meaning_str)
-            
+                    word_str, meaning_str = cells[0], cells[1]
+                    if not (word_str and meaning_str):
+                        continue
+                    serial_num = row_idx
+                else:
+                    continue
+
+                word, phonetic = _split_phonetic(word_str)
+                if word:
+                    yield serial_num, word, phonetic, meaning_str
+
             except Exception as e:
                 logger.warning(f'解析第{row_idx}行失败: {e}')
-        
-        sorted_words = []
-        if word_dict:
-            max_serial = max(word_dict.keys())
-            for i in range(1, max_serial + 1):
-                if i in word_dict:
-                    sorted_words.append(word_dict[i])
-        
-        logger.info(f'完成，共{len(sorted_words)}个单词')
-        
+    finally:
+        workbook.close()
+
+
+def parse_excel(excel_path):
+    """解析 Excel，返回按序号排列的 (word, phonetic, translation) 列表
+
+    序号重复时保留第一次出现的行。
+    """
+    records = []
+    seen = set()
+    in_order = True
+    last_serial = 0
+    try:
+        for record in iter_excel_words(excel_path):
+            serial = record[0]
+            if serial in seen:
+                continue
+            seen.add(serial)
+            if serial < last_serial:
+                in_order = False
+            last_serial = serial
+            records.append(record)
+
+        # 绝大多数表格按序号排列，只有乱序时才需要排序
+        if not in_order:
+            records.sort(key=lambda record: record[0])
+
+        logger.info(f'完成，共{len(records)}个单词')
+
     except FileNotFoundError:
         raise Exception(f'找不到文件: {excel_path}')
     except Exception as e:
         logger.error(f'解析失败: {e}', exc_info=True)
         raise Exception(f'解析失败: {e}')
-    
-    return sorted_words
+
+    return [(word, phonetic, translation) for _, word, phonetic, translation in records]
@@ -0,0 +1,21 @@
+from flask import request, make_response
+
+
+def make_etag(*parts):
+    """由版本号、范围等拼出强 ETag（不含引号）"""
+    return '-'.join(str(part) for part in parts)
+
+
+def not_modified(etag, cache_control):
+    """请求的 If-None-Match 与 etag 匹配时返回 304 响应，否则返回 None"""
+    if not request.if_none_match.contains(etag):
+        return None
+
+    response = make_response('', 304)
+    return with_cache_headers(response, etag, cache_control)
+
+
+def with_cache_headers(response, etag, cache_control):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
@@ -0,0 +1,141 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from ..config import Config
+from ..extensions import db
+from ..models.import_job import ImportJob
+from .parse_cache import parse_upload
+from .word_importer import import_wordbook
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# 正在插入的任务的实时进度，只在执行任务的进程内可见
+# （导入事务未提交前，SQLite 不允许其他连接写入任务表）
+_live_rows = {}
+
+# 未结束的阶段；进程退出时这些任务的后台线程随之消失，不会再更新
+UNFINISHED_PHASES = ('queued', 'parsing', 'inserting')
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=Config.IMPORT_WORKERS,
+                    thread_name_prefix='import-job'
+                )
+    return _executor
+
+
+def _update_job(job_id, **values):
+    """用独立连接更新任务状态，不影响导入事务"""
+    table = ImportJob.__table__
+    with db.engine.begin() as conn:
+        conn.execute(table.update().where(table.c.id == job_id).values(**values))
+
+
+def _run_job(app, job_id, source, kind, name, is_active):
+    with app.app_context():
+        try:
+            _update_job(job_id, phase='parsing', started_at=datetime.utcnow())
+            words = parse_upload(source, kind)
+            if not words:
+                raise ValueError('未找到有效的单词数据')
+
+            _update_job(job_id, phase='inserting', rows_parsed=len(words), parsed_at=datetime.utcnow())
+
+            def on_progress(inserted):
+                _live_rows[job_id] = inserted
+
+            wordbook, stats = import_wordbook(name, words, is_active=is_active, progress=on_progress)
+
+            _update_job(
+                job_id,
+                phase='done',
+                rows_inserted=stats['rows'],
+                wordbook_id=wordbook.id,
+                message=f'成功导入 {stats["rows"]} 个单词，{stats["rows_per_sec"]} 行/秒',
+                finished_at=datetime.utcnow()
+            )
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f'导入任务 {job_id} 失败: {e}', exc_info=True)
+            _update_job(job_id, phase='failed', message=str(e), finished_at=datetime.utcnow())
+        finally:
+            _live_rows.pop(job_id, None)
+            db.session.remove()
+            source.close()
+
+
+def _delete_finished_jobs():
+    """删除结束超过 IMPORT_JOB_RETENTION_DAYS 天的任务记录，返回删除的行数"""
+    if Config.IMPORT_JOB_RETENTION_DAYS <= 0:
+        return 0
+    table = ImportJob.__table__
+    cutoff = datetime.utcnow() - timedelta(days=Config.IMPORT_JOB_RETENTION_DAYS)
+    with db.engine.begin() as conn:
+        return conn.execute(table.delete().where(
+            table.c.phase.in_(('done', 'failed')),
+            table.c.finished_at < cutoff
+        )).rowcount
+
+
+def init_import_jobs(app):
+    """启动时调用：把上次进程遗留的未完成任务标记为失败，并清理过期的任务记录
+
+    任务只在提交它的进程内执行，进程启动前登记、仍未结束的任务已经不会再有进展，
+    不标记的话客户端会一直轮询到 queued / parsing。
+    """
+    started_at = datetime.utcnow()
+    table = ImportJob.__table__
+    with app.app_context():
+        try:
+            with db.engine.begin() as conn:
+                interrupted = conn.execute(table.update().where(
+                    table.c.phase.in_(UNFINISHED_PHASES),
+                    table.c.created_at < started_at
+                ).values(phase='failed', message='服务重启，导入已中断，请重新上传', finished_at=started_at)).rowcount
+            if interrupted:
+                logger.warning(f'{interrupted} 个导入任务因服务重启中断')
+            _delete_finished_jobs()
+        except Exception as e:
+            logger.error(f'整理导入任务失败: {e}')
+
+
+def submit_import(source, kind, name, is_active=False):
+    """登记导入任务并交给后台线程执行，返回任务 ID
+
+    source 为上传缓冲区（见 upload_buffer.detach_upload），任务结束后负责关闭它。
+    IMPORT_ASYNC 关闭时（如 Vercel，响应返回后函数会被冻结）在当前请求内同步执行。
+    """
+    _delete_finished_jobs()
+    job_id = uuid.uuid4().hex
+    db.session.add(ImportJob(id=job_id, name=name, kind=kind, phase='queued'))
+    db.session.commit()
+
+    app = current_app._get_current_object()
+    if Config.IMPORT_ASYNC:
+        _get_executor().submit(_run_job, app, job_id, source, kind, name, is_active)
+    else:
+        _run_job(app, job_id, source, kind, name, is_active)
+    return job_id
+
+
+def get_job(job_id):
+    """返回任务状态字典，不存在时返回 None"""
+    job = ImportJob.query.get(job_id)
+    if not job:
+        return None
+
+    result = job.to_dict()
+    if job.phase == 'inserting' and job_id in _live_rows:
+        result['rows_inserted'] = _live_rows[job_id]
+    return result
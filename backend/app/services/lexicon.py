@@ -0,0 +1,53 @@
+from sqlalchemy import select
+from ..extensions import db
+from ..models.lexeme import Lexeme
+from .upsert import upsert
+
+# 每批按摘要查询 / 插入的词条数
+# 插入时每行 4 个参数，旧版 SQLite 的绑定参数上限为 999，每批不能超过 249 行
+LOOKUP_CHUNK = 200
+
+
+def resolve_lexemes(entries, executor=None):
+    """把 (word, phonetic, translation) 序列映射为词条ID
+
+    按内容摘要去重：已有的词条直接复用，缺少的批量插入（冲突时忽略，并发导入同一词条不会失败）
+    后再查出ID。executor 默认为 db.session，也可传入 Connection，由调用方负责提交。
+    返回 (与 entries 一一对应的 lexeme_id 列表, 新建词条数)。
+    """
+    executor = executor or db.session
+    table = Lexeme.__table__
+    keys = [Lexeme.make_key(*entry) for entry in entries]
+
+    unique = {}
+    for key, entry in zip(keys, entries):
+        unique.setdefault(key, entry)
+    unique_keys = list(unique)
+
+    ids = {}
+    created = 0
+    insert = upsert(table, ['key_hash'])
+    for start in range(0, len(unique_keys), LOOKUP_CHUNK):
+        chunk = unique_keys[start:start + LOOKUP_CHUNK]
+        ids.update(executor.execute(
+            select(table.c.key_hash, table.c.id).where(table.c.key_hash.in_(chunk))
+        ).all())
+
+        missing = [key for key in chunk if key not in ids]
+        if not missing:
+            continue
+        executor.execute(insert, [
+            {
+                'key_hash': key,
+                'word': unique[key][0],
+                'phonetic': unique[key][1],
+                'translation': unique[key][2]
+            }
+            for key in missing
+        ])
+        ids.update(executor.execute(
+            select(table.c.key_hash, table.c.id).where(table.c.key_hash.in_(missing))
+        ).all())
+        created += len(missing)
+
+    return [ids[key] for key in keys], created
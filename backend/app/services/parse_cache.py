@@ -0,0 +1,192 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 解析器输出格式变化时递增，使旧缓存自动失效
+PARSER_VERSION = 1
+
+CACHE_SUFFIX = '.json.gz'
+
+
+def hash_file(source, chunk_size=1024 * 1024):
+    """计算文件内容的 SHA-256，source 为文件路径或可 seek 的文件对象"""
+    digest = hashlib.sha256()
+    if hasattr(source, 'read'):
+        source.seek(0)
+        for chunk in iter(lambda: source.read(chunk_size), b''):
+            digest.update(chunk)
+        source.seek(0)
+    else:
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """按文件内容哈希缓存解析结果的磁盘缓存
+
+    每个条目是一个 gzip 压缩的 JSON 文件，文件 mtime 作为最近使用时间，
+    总大小超过 max_bytes 时按 LRU 淘汰。多个进程可以共享同一目录，
+    写入使用临时文件加 os.replace 保证原子性；命中计数只统计本进程。
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def key_for(self, content_hash, kind):
+        return f'{kind}-v{PARSER_VERSION}-{content_hash}'
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    def get(self, key):
+        """返回缓存的单词元组列表，未命中返回 None"""
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                words = [tuple(item) for item in json.load(f)]
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f'解析缓存损坏，已丢弃: {key}: {e}')
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return words
+
+    def put(self, key, words):
+        if not self.enabled:
+            return
+
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8') as f:
+                json.dump(words, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f'写入解析缓存失败: {e}')
+            if tmp_path:
+                self._remove(tmp_path)
+            return
+
+        self._evict()
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _entries(self):
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(CACHE_SUFFIX):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self):
+        entries = self._entries()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'entries': len(entries),
+                'size_bytes': sum(size for _, size, _ in entries),
+                'max_bytes': self.max_bytes
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_parse_cache():
+    """返回进程内共享的解析缓存实例"""
+    global _cache
+    if _cache is None:
+        from ..config import Config
+        with _cache_lock:
+            if _cache is None:
+                _cache = ParseCache(
+                    os.path.join(Config.UPLOAD_FOLDER, 'parse_cache'),
+                    Config.PARSE_CACHE_MAX_BYTES
+                )
+    return _cache
+
+
+def parse_upload(source, kind):
+    """解析上传的词库文件，相同内容的文件直接使用缓存结果
+
+    source 为文件路径或上传缓冲区。
+    """
+    from ..config import Config
+    from .PDF_reader import extract_words_from_pdf
+    from .excel_parser import parse_excel
+
+    cache = get_parse_cache()
+    key = cache.key_for(hash_file(source), kind) if cache.enabled else None
+
+    words = cache.get(key) if key else None
+    if words is not None:
+        return words
+
+    if kind == 'pdf':
+        words = extract_words_from_pdf(source, workers=Config.PDF_PARSE_WORKERS)
+    else:
+        words = parse_excel(source)
+
+    if words and key:
+        cache.put(key, words)
+    return words
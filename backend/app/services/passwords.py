@@ -0,0 +1,101 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ..config import Config
+from ..extensions import bcrypt
+
+logger = logging.getLogger(__name__)
+
+# 密码哈希和校验交给固定大小的线程池（bcrypt 计算时释放 GIL，可以占满多个核），
+# 并限制排队数量：登录高峰时超出的请求立即返回 503，而不是让所有请求线程一起卡在 bcrypt 上。
+
+
+class PasswordHasherBusy(Exception):
+    """排队的哈希任务已满"""
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = None
+_stats_lock = threading.Lock()
+_stats = {'hashed': 0, 'checked': 0, 'rehashed': 0, 'rejected': 0}
+
+
+def _workers():
+    return Config.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+
+
+def _get_executor():
+    global _executor, _slots
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # 正在计算的加上排队的，超过后拒绝
+                _slots = threading.BoundedSemaphore(_workers() + Config.PASSWORD_HASH_QUEUE_MAX)
+                _executor = ThreadPoolExecutor(max_workers=_workers(), thread_name_prefix='password-hash')
+    return _executor
+
+
+def _run(fn, *args):
+    executor = _get_executor()
+    if not _slots.acquire(blocking=False):
+        with _stats_lock:
+            _stats['rejected'] += 1
+        raise PasswordHasherBusy()
+    try:
+        return executor.submit(fn, *args).result()
+    finally:
+        _slots.release()
+
+
+def _count(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def hash_password(password):
+    """按 BCRYPT_LOG_ROUNDS 计算密码哈希，返回字符串"""
+    password_hash = _run(bcrypt.generate_password_hash, password, Config.BCRYPT_LOG_ROUNDS)
+    _count('hashed')
+    return password_hash.decode('utf-8')
+
+
+def check_password(password_hash, password):
+    result = _run(bcrypt.check_password_hash, password_hash, password)
+    _count('checked')
+    return result
+
+
+def needs_rehash(password_hash):
+    """哈希的强度与当前 BCRYPT_LOG_ROUNDS 不同（配置调整过）时返回 True"""
+    try:
+        return int(password_hash.split('$')[2]) != Config.BCRYPT_LOG_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
+def rehash_if_needed(user, password):
+    """登录校验成功后调用：强度不同则用当前配置重新计算并写回 user，返回是否修改
+
+    重新计算失败（如排队已满）不影响本次登录，下次登录再试，由调用方提交事务。
+    """
+    if not needs_rehash(user.password_hash):
+        return False
+    try:
+        user.password_hash = hash_password(password)
+    except PasswordHasherBusy:
+        return False
+    _count('rehashed')
+    return True
+
+
+def hasher_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats.update({
+        'workers': _workers(),
+        'queue_max': Config.PASSWORD_HASH_QUEUE_MAX,
+        'log_rounds': Config.BCRYPT_LOG_ROUNDS
+    })
+    return stats
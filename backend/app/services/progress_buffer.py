@@ -0,0 +1,133 @@
+import threading
+import time
+from datetime import datetime
+from ..config import Config
+from ..models.user_progress import UserProgress
+from .upsert import upsert
+from .write_behind import RetryCounter, start_flusher, write_rows
+
+# 尚未写入数据库的学习进度：(user_id, wordbook_id) -> (current_index, last_learn_time)
+# 连续翻卡时同一本书只保留最后一个位置
+_lock = threading.Lock()
+_pending = {}
+_last_flush = time.monotonic()
+
+_flush_lock = threading.Lock()
+_flusher = None
+
+
+def record_progress(user_id, wordbook_id, current_index):
+    """记录学习进度，按时间间隔或数量批量写入数据库
+
+    PROGRESS_WRITE_BEHIND 关闭时立即写入。
+    """
+    with _lock:
+        _pending[(user_id, wordbook_id)] = (current_index, datetime.utcnow())
+        due = (
+            not Config.PROGRESS_WRITE_BEHIND
+            or len(_pending) >= Config.PROGRESS_FLUSH_SIZE
+            or time.monotonic() - _last_flush >= Config.PROGRESS_FLUSH_INTERVAL
+        )
+    if due:
+        flush_progress()
+
+
+def pending_progress(user_id, wordbook_id=None):
+    """返回该用户尚未写入的进度 {wordbook_id: (current_index, last_learn_time)}"""
+    with _lock:
+        return {
+            key[1]: value for key, value in _pending.items()
+            if key[0] == user_id and (wordbook_id is None or key[1] == wordbook_id)
+        }
+
+
+def before_read():
+    """读取进度前调用，PROGRESS_FLUSH_ON_READ 开启时先写入缓冲的进度"""
+    if Config.PROGRESS_FLUSH_ON_READ and _pending:
+        flush_progress()
+
+
+def discard_progress(user_id=None, wordbook_id=None):
+    """丢弃缓冲中的进度
+
+    直接写入 user_progress（重置进度、advance）或删除用户、单词书之前调用，
+    避免稍后写入的旧位置覆盖新数据或重新插入已删除的记录。
+    正在进行的写入已经取走了缓冲，这里先等它完成，它写入的旧位置会被随后的直接写入覆盖。
+    调用时当前会话不应持有写锁（SQLite），否则写入线程要等到锁超时。
+    """
+    with _flush_lock, _lock:
+        for key in list(_pending):
+            if (user_id is None or key[0] == user_id) and (wordbook_id is None or key[1] == wordbook_id):
+                del _pending[key]
+
+
+def progress_upsert(dialect=None):
+    """user_progress 的插入或更新语句，参数为 user_id、wordbook_id、current_index、last_learn_time"""
+    return upsert(
+        UserProgress.__table__,
+        ['user_id', 'wordbook_id'],
+        ['current_index', 'last_learn_time'],
+        dialect=dialect
+    )
+
+
+def _row_key(row):
+    return row['user_id'], row['wordbook_id']
+
+
+_retries = RetryCounter(_row_key, '学习进度')
+
+
+def _write(conn, rows):
+    conn.execute(progress_upsert(conn.dialect.name), rows)
+
+
+def flush_progress():
+    """把缓冲的进度写入数据库，返回写入的条数
+
+    用独立连接批量执行插入或更新，不影响当前请求的会话。某一行无法写入
+    （如对应的用户、单词书已不存在）时只丢弃这一行，其余照常写入。
+    """
+    global _last_flush
+    with _flush_lock:
+        with _lock:
+            entries = dict(_pending)
+            _pending.clear()
+            _last_flush = time.monotonic()
+        if not entries:
+            return 0
+
+        rows = [
+            {
+                'user_id': user_id,
+                'wordbook_id': wordbook_id,
+                'current_index': current_index,
+                'last_learn_time': learn_time
+            }
+            for (user_id, wordbook_id), (current_index, learn_time) in entries.items()
+        ]
+        written, retry = write_rows(_write, rows, '学习进度')
+        retry_keys = {_row_key(row) for row in retry}
+        _retries.forget([row for row in rows if _row_key(row) not in retry_keys])
+
+        # 放回缓冲区，已有更新的位置则以新位置为准
+        retry = _retries.requeue(retry)
+        with _lock:
+            for row in retry:
+                key = _row_key(row)
+                _pending.setdefault(key, entries[key])
+        return written
+
+
+def init_progress_buffer(app):
+    """启动定时写入线程并注册退出时写入，在 create_app 中调用"""
+    global _flusher
+    if _flusher is not None or not Config.PROGRESS_WRITE_BEHIND:
+        return
+
+    _flusher = start_flusher(
+        app, 'progress-flush',
+        lambda: Config.PROGRESS_FLUSH_INTERVAL,
+        lambda: bool(_pending),
+        flush_progress
+    )
@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+from sqlalchemy import select
+from ..config import Config
+from ..extensions import db
+from ..models.review_state import ReviewState
+from ..models.study_event import StudyEvent
+from ..models.user import User
+from ..models.user_progress import UserProgress
+from ..models.vocabulary import Vocabulary
+from ..models.word import Word
+from ..models.wordbook import Wordbook
+from .event_buffer import discard_events
+from .progress_buffer import discard_progress
+from .vocabulary_cache import invalidate_vocabulary
+
+logger = logging.getLogger(__name__)
+
+# 删除单词书或用户时，请求内只设置 deleted_at（之后对所有接口不可见），
+# 关联数据由这里分批清理：每批按主键取出至多 PURGE_BATCH_SIZE 行并在独立的短事务中删除，
+# 不会长时间锁住 words 等大表。清理到一半进程退出也没关系，启动后会继续清理。
+# 学习事件是只追加的日志，删除单词书时保留，删除用户时一并清理。
+
+_purge_lock = threading.Lock()
+_wakeup = threading.Event()
+_app = None
+_worker = None
+
+
+def _delete_in_batches(table, condition):
+    """分批删除满足条件的行，返回删除的行数"""
+    deleted = 0
+    while True:
+        with db.engine.begin() as conn:
+            ids = conn.execute(
+                select(table.c.id).where(condition).limit(Config.PURGE_BATCH_SIZE)
+            ).scalars().all()
+            if not ids:
+                return deleted
+            conn.execute(table.delete().where(table.c.id.in_(ids)))
+        deleted += len(ids)
+        time.sleep(Config.PURGE_BATCH_PAUSE)
+
+
+def _purge_wordbook(wordbook_id):
+    words = Word.__table__
+    vocabulary = Vocabulary.__table__
+    review_states = ReviewState.__table__
+    removed = 0
+
+    while True:
+        with db.engine.connect() as conn:
+            word_ids = conn.execute(
+                select(words.c.id).where(words.c.wordbook_id == wordbook_id).limit(Config.PURGE_BATCH_SIZE)
+            ).scalars().all()
+            user_ids = conn.execute(
+                select(vocabulary.c.user_id).where(vocabulary.c.word_id.in_(word_ids)).distinct()
+            ).scalars().all() if word_ids else []
+        if not word_ids:
+            break
+
+        # 先删引用这批单词的行，再删单词本身
+        _delete_in_batches(vocabulary, vocabulary.c.word_id.in_(word_ids))
+        _delete_in_batches(review_states, review_states.c.word_id.in_(word_ids))
+        removed += _delete_in_batches(words, words.c.id.in_(word_ids))
+        for user_id in user_ids:
+            invalidate_vocabulary(user_id)
+
+    discard_progress(wordbook_id=wordbook_id)
+    _delete_in_batches(UserProgress.__table__, UserProgress.__table__.c.wordbook_id == wordbook_id)
+
+    # 清理期间仍可能有缓冲的进度，删除单词书前再丢弃一次，避免之后写入孤立的记录
+    discard_progress(wordbook_id=wordbook_id)
+    with db.engine.begin() as conn:
+        conn.execute(Wordbook.__table__.delete().where(Wordbook.__table__.c.id == wordbook_id))
+    logger.info(f'单词书 {wordbook_id} 清理完成，删除 {removed} 个单词')
+
+
+def _purge_user(user_id):
+    discard_progress(user_id=user_id)
+    discard_events(user_id)
+    for model in (Vocabulary, UserProgress, ReviewState, StudyEvent):
+        table = model.__table__
+        _delete_in_batches(table, table.c.user_id == user_id)
+    invalidate_vocabulary(user_id)
+
+    # 同上，删除用户前再丢弃一次清理期间缓冲的进度和事件
+    discard_progress(user_id=user_id)
+    discard_events(user_id)
+    with db.engine.begin() as conn:
+        conn.execute(User.__table__.delete().where(User.__table__.c.id == user_id))
+    logger.info(f'用户 {user_id} 清理完成')
+
+
+def run_pending_purges():
+    """清理所有已标记删除的单词书和用户，返回 (单词书数, 用户数)"""
+    with _purge_lock:
+        with db.engine.connect() as conn:
+            wordbook_ids = conn.execute(
+                select(Wordbook.__table__.c.id).where(Wordbook.__table__.c.deleted_at.isnot(None))
+            ).scalars().all()
+            user_ids = conn.execute(
+                select(User.__table__.c.id).where(User.__table__.c.deleted_at.isnot(None))
+            ).scalars().all()
+
+        for wordbook_id in wordbook_ids:
+            _purge_wordbook(wordbook_id)
+        for user_id in user_ids:
+            _purge_user(user_id)
+        return len(wordbook_ids), len(user_ids)
+
+
+def schedule_purge():
+    """标记删除并提交后调用
+
+    PURGE_ASYNC 开启时唤醒后台线程，否则在当前请求内清理。
+    """
+    if _worker is not None:
+        _wakeup.set()
+        return
+    try:
+        run_pending_purges()
+    except Exception as e:
+        # 已经标记删除，清理失败下次删除时会继续
+        logger.error(f'清理已删除数据失败: {e}', exc_info=True)
+
+
+def _purge_loop():
+    while True:
+        try:
+            with _app.app_context():
+                run_pending_purges()
+        except Exception as e:
+            logger.error(f'清理已删除数据失败: {e}', exc_info=True)
+        # 没有新的删除时也定期检查一次，接手其他进程未完成的清理
+        _wakeup.wait(timeout=300)
+        _wakeup.clear()
+
+
+def init_purge_worker(app):
+    """启动后台清理线程（启动时先继续未完成的清理），在 create_app 中调用"""
+    global _app, _worker
+    _app = app
+    if _worker is not None or not Config.PURGE_ASYNC:
+        return
+
+    _worker = threading.Thread(target=_purge_loop, name='purge', daemon=True)
+    _worker.start()
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+from ..config import Config
+from ..extensions import db
+from ..models.review_state import ReviewState
+from ..models.word import Word
+from ..models.wordbook import Wordbook
+from .upsert import upsert
+
+MIN_EASE_FACTOR = 1.3
+DEFAULT_EASE_FACTOR = 2.5
+
+# 评分后需要写回的列
+SCHEDULE_COLUMNS = ['repetitions', 'interval_days', 'ease_factor', 'lapses', 'due_at', 'last_reviewed_at']
+
+
+def sm2(repetitions, interval_days, ease_factor, quality):
+    """SM-2 算法：根据评分（0-5）计算新的 (repetitions, interval_days, ease_factor, lapsed)"""
+    if quality < 3:
+        # 答错：从头开始，明天再复习
+        repetitions = 0
+        interval_days = 1
+        lapsed = True
+    else:
+        if repetitions == 0:
+            interval_days = 1
+        elif repetitions == 1:
+            interval_days = 6
+        else:
+            interval_days = max(1, round(interval_days * ease_factor))
+        repetitions += 1
+        lapsed = False
+
+    ease_factor += 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    return repetitions, interval_days, max(ease_factor, MIN_EASE_FACTOR), lapsed
+
+
+def next_due(user_id, n, now=None):
+    """取出最早到期的 n 个单词，返回 [(状态字典, 单词字典)]
+
+    沿 (user_id, due_at) 索引按到期时间顺序扫描，只读取需要的行；
+    取出的单词在 REVIEW_LEASE_SECONDS 内不会再次返回，评分后按新的间隔排期。
+    已删除（等待清理）的单词书中的单词不再返回。
+    """
+    now = now or datetime.utcnow()
+    rows = db.session.query(ReviewState, Word).join(
+        Word, Word.id == ReviewState.word_id
+    ).join(
+        Wordbook, Wordbook.id == Word.wordbook_id
+    ).filter(
+        ReviewState.user_id == user_id,
+        ReviewState.due_at <= now,
+        Wordbook.deleted_at.is_(None)
+    ).order_by(ReviewState.due_at).limit(n).all()
+
+    # 提交会让 ORM 对象过期，先序列化
+    result = [(state.to_dict(), word.to_dict()) for state, word in rows]
+
+    if rows and Config.REVIEW_LEASE_SECONDS > 0:
+        ReviewState.query.filter(
+            ReviewState.id.in_([state.id for state, _ in rows])
+        ).update({'due_at': now + timedelta(seconds=Config.REVIEW_LEASE_SECONDS)}, synchronize_session=False)
+        db.session.commit()
+
+    return result
+
+
+def grade_reviews(user_id, grades, now=None):
+    """批量评分，grades 为 [(word_id, quality)]，按顺序应用
+
+    一次查询读出单词和已有状态，一条批量 upsert 写回；首次评分的单词自动加入复习。
+    返回 (更新后的状态字典列表, 不存在的单词ID列表)，已删除单词书中的单词视为不存在。
+    """
+    now = now or datetime.utcnow()
+    word_ids = list(dict.fromkeys(word_id for word_id, _ in grades))
+
+    rows = db.session.query(Word.id, ReviewState).outerjoin(
+        ReviewState,
+        db.and_(ReviewState.word_id == Word.id, ReviewState.user_id == user_id)
+    ).join(
+        Wordbook, Wordbook.id == Word.wordbook_id
+    ).filter(Word.id.in_(word_ids), Wordbook.deleted_at.is_(None)).all()
+
+    states = {}
+    for word_id, state in rows:
+        if state:
+            states[word_id] = {
+                'repetitions': state.repetitions,
+                'interval_days': state.interval_days,
+                'ease_factor': state.ease_factor,
+                'lapses': state.lapses
+            }
+        else:
+            states[word_id] = {
+                'repetitions': 0,
+                'interval_days': 0,
+                'ease_factor': DEFAULT_EASE_FACTOR,
+                'lapses': 0
+            }
+
+    for word_id, quality in grades:
+        state = states.get(word_id)
+        if state is None:
+            continue
+        repetitions, interval_days, ease_factor, lapsed = sm2(
+            state['repetitions'], state['interval_days'], state['ease_factor'], quality
+        )
+        state.update(
+            repetitions=repetitions,
+            interval_days=interval_days,
+            ease_factor=ease_factor,
+            lapses=state['lapses'] + int(lapsed),
+            due_at=now + timedelta(days=interval_days),
+            last_reviewed_at=now
+        )
+
+    if states:
+        db.session.execute(
+            upsert(ReviewState.__table__, ['user_id', 'word_id'], SCHEDULE_COLUMNS),
+            [{'user_id': user_id, 'word_id': word_id, **state} for word_id, state in states.items()]
+        )
+        db.session.commit()
+
+    updated = [
+        {
+            'word_id': word_id,
+            'repetitions': state['repetitions'],
+            'interval_days': state['interval_days'],
+            'ease_factor': round(state['ease_factor'], 2),
+            'lapses': state['lapses'],
+            'due_at': state['due_at'].isoformat()
+        }
+        for word_id, state in states.items()
+    ]
+    return updated, [word_id for word_id in word_ids if word_id not in states]
@@ -0,0 +1,161 @@
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import inspect, text
+from ..extensions import db
+
+logger = logging.getLogger(__name__)
+
+# db.create_all() 只创建缺失的表，不会修改已存在的表。
+# 后来给已有表新增的列登记在这里，启动时补齐。
+ADDED_COLUMNS = [
+    ('wordbooks', 'version'),
+    ('wordbooks', 'deleted_at'),
+    ('users', 'deleted_at'),
+]
+
+# 同理，后来新增的索引：(表名, 索引名)
+ADDED_INDEXES = [
+    ('vocabulary', 'idx_user_added'),
+    ('vocabulary', 'idx_vocabulary_word'),
+    ('review_states', 'idx_review_word'),
+]
+
+# 旧版允许为空、现在依赖非空的列：(表名, 列名, 补齐的值)
+# 生词本按 (added_at, id) 游标翻页，旧数据的空 added_at 按最早加入处理
+NULL_BACKFILLS = [
+    ('vocabulary', 'added_at', datetime(1970, 1, 1)),
+]
+
+# 迁移旧版 words 表时每批处理的行数
+LEXEME_MIGRATION_BATCH = 5000
+
+# 多个 gunicorn worker 同时启动时，只有持有数据库锁的一个执行迁移，其余等待后重新检查
+SCHEMA_LOCK_NAME = 'word_learning_schema'
+SCHEMA_LOCK_KEY = 0x57424b53  # PostgreSQL advisory lock 的键
+SCHEMA_LOCK_TIMEOUT = 600  # 秒
+
+
+def _add_column(conn, table, column):
+    dialect = conn.dialect
+    ddl = f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=dialect)}'
+    if column.server_default is not None:
+        ddl += f" DEFAULT '{column.server_default.arg}'"
+    if not column.nullable:
+        ddl += ' NOT NULL'
+    conn.execute(text(ddl))
+
+
+def _migrate_lexemes(conn, word_columns):
+    """把旧版 words 表中的单词内容迁移到共享的 lexemes 表
+
+    旧版每行自带 word / phonetic / translation，这里按内容去重写入 lexemes，
+    回填 words.lexeme_id 后删除这三列。
+    """
+    from .lexicon import resolve_lexemes
+
+    dialect = conn.dialect.name
+    if 'lexeme_id' not in word_columns:
+        conn.execute(text('ALTER TABLE words ADD COLUMN lexeme_id INTEGER'))
+
+    last_id = 0
+    migrated = 0
+    while True:
+        rows = conn.execute(text(
+            'SELECT id, word, phonetic, translation FROM words WHERE id > :last_id ORDER BY id LIMIT :limit'
+        ), {'last_id': last_id, 'limit': LEXEME_MIGRATION_BATCH}).all()
+        if not rows:
+            break
+        lexeme_ids, _ = resolve_lexemes([(word, phonetic, translation) for _, word, phonetic, translation in rows], conn)
+        conn.execute(text('UPDATE words SET lexeme_id = :lexeme_id WHERE id = :id'), [
+            {'id': row[0], 'lexeme_id': lexeme_id} for row, lexeme_id in zip(rows, lexeme_ids)
+        ])
+        last_id = rows[-1][0]
+        migrated += len(rows)
+
+    if dialect == 'sqlite':
+        # SQLite 3.35+ 支持 DROP COLUMN，但不能修改已有列的约束，lexeme_id 保持可空
+        for column in ('word', 'phonetic', 'translation'):
+            conn.execute(text(f'ALTER TABLE words DROP COLUMN {column}'))
+    elif dialect in ('mysql', 'mariadb'):
+        conn.execute(text(
+            'ALTER TABLE words MODIFY lexeme_id INTEGER NOT NULL, '
+            'ADD FOREIGN KEY (lexeme_id) REFERENCES lexemes (id), '
+            'DROP COLUMN word, DROP COLUMN phonetic, DROP COLUMN translation'
+        ))
+    else:
+        conn.execute(text(
+            'ALTER TABLE words ALTER COLUMN lexeme_id SET NOT NULL, '
+            'ADD FOREIGN KEY (lexeme_id) REFERENCES lexemes (id), '
+            'DROP COLUMN word, DROP COLUMN phonetic, DROP COLUMN translation'
+        ))
+    logger.info(f'已将 {migrated} 个单词迁移到 lexemes 表')
+
+
+@contextmanager
+def _schema_lock():
+    """在数据库层面加锁，返回持有锁、处于事务中的连接；正常退出时提交
+
+    SQLite 用 BEGIN IMMEDIATE 取得写锁，MySQL 用 GET_LOCK，PostgreSQL 用事务级 advisory lock。
+    """
+    with db.engine.connect() as conn:
+        dialect = conn.dialect.name
+        if dialect == 'sqlite':
+            conn.exec_driver_sql(f'PRAGMA busy_timeout = {SCHEMA_LOCK_TIMEOUT * 1000}')
+            conn.exec_driver_sql('BEGIN IMMEDIATE')
+        elif dialect in ('mysql', 'mariadb'):
+            acquired = conn.execute(
+                text('SELECT GET_LOCK(:name, :timeout)'),
+                {'name': SCHEMA_LOCK_NAME, 'timeout': SCHEMA_LOCK_TIMEOUT}
+            ).scalar()
+            if acquired != 1:
+                raise RuntimeError('等待其他进程完成数据库迁移超时')
+        elif dialect == 'postgresql':
+            conn.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': SCHEMA_LOCK_KEY})
+
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if dialect in ('mysql', 'mariadb'):
+                # GET_LOCK 属于会话，不随事务释放
+                conn.execute(text('SELECT RELEASE_LOCK(:name)'), {'name': SCHEMA_LOCK_NAME})
+
+
+def upgrade_schema():
+    """给已有数据库补齐新增的列和索引，在 db.create_all() 之后调用
+
+    在数据库锁内检查和修改，其他进程完成迁移后这里看到的已是新表结构，不会重复执行。
+    """
+    tables = db.metadata.tables
+
+    with _schema_lock() as conn:
+        inspector = inspect(conn)
+        word_columns = {column['name'] for column in inspector.get_columns('words')}
+        if 'translation' in word_columns:
+            logger.info('迁移 words 表到 lexemes')
+            _migrate_lexemes(conn, word_columns)
+
+        for table_name, column_name in ADDED_COLUMNS:
+            existing = {column['name'] for column in inspector.get_columns(table_name)}
+            if column_name not in existing:
+                logger.info(f'添加列 {table_name}.{column_name}')
+                _add_column(conn, tables[table_name], tables[table_name].c[column_name])
+
+        for table_name, index_name in ADDED_INDEXES:
+            existing = {index['name'] for index in inspector.get_indexes(table_name)}
+            if index_name not in existing:
+                logger.info(f'创建索引 {table_name}.{index_name}')
+                index = next(index for index in tables[table_name].indexes if index.name == index_name)
+                index.create(conn)
+
+        for table_name, column_name, value in NULL_BACKFILLS:
+            column = tables[table_name].c[column_name]
+            filled = conn.execute(
+                tables[table_name].update().where(column.is_(None)).values({column_name: value})
+            ).rowcount
+            if filled:
+                logger.info(f'补齐 {table_name}.{column_name} 的 {filled} 个空值')
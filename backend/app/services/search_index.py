@@ -0,0 +1,227 @@
+import heapq
+import re
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from ..config import Config
+from ..models.wordbook import Wordbook
+from .catalog_cache import get_catalog, set_catalog, current_generation
+from .wordbook_cache import get_wordbook_content
+
+# 单词搜索索引，每本单词书一个分段：
+# - 英文：规范化（小写、去重音、合并空格）后的单词排序数组，按前缀二分查找
+# - 中文：释义的单字和相邻两字倒排表，查询时取交集再校验子串
+# 导入时直接用内存中的单词建立分段；其他情况（进程重启、内容变化）在首次搜索时从单词书内容缓存建立。
+# 与单词书内容缓存相同，按单词总数（SEARCH_INDEX_MAX_WORDS）限制内存，淘汰最久未搜索的分段
+
+_CJK = re.compile(r'[㐀-鿿豈-﫿]')
+_CJK_RUN = re.compile(r'[㐀-鿿豈-﫿]+')
+_SPACES = re.compile(r'\s+')
+
+_lock = threading.Lock()
+_segments = OrderedDict()  # wordbook_id -> IndexSegment，按最近使用排序
+_cached_words = 0
+
+
+def normalize(text):
+    """英文检索用的规范形式"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return _SPACES.sub(' ', text).strip().lower()
+
+
+def _cjk_runs(text):
+    """释义中连续的中文片段"""
+    return _CJK_RUN.findall(text or '')
+
+
+class IndexSegment:
+    """一本单词书的搜索索引"""
+
+    __slots__ = ('wordbook_id', 'version', 'ids', 'orders', 'words', 'phonetics', 'translations',
+                 'keys', 'key_positions', 'postings')
+
+    def __init__(self, wordbook_id, version, ids, orders, words, phonetics, translations):
+        self.wordbook_id = wordbook_id
+        self.version = version
+        self.ids = array('q', ids)
+        self.orders = array('l', orders)
+        self.words = list(words)
+        self.phonetics = list(phonetics)
+        self.translations = list(translations)
+
+        pairs = sorted((normalize(word), i) for i, word in enumerate(self.words))
+        self.keys = [key for key, _ in pairs]
+        self.key_positions = array('l', (i for _, i in pairs))
+
+        postings = {}
+        for i, translation in enumerate(self.translations):
+            grams = set()
+            for run in _cjk_runs(translation):
+                grams.update(run)
+                grams.update(run[j:j + 2] for j in range(len(run) - 1))
+            for gram in grams:
+                postings.setdefault(gram, array('l')).append(i)
+        self.postings = postings
+
+    def __len__(self):
+        return len(self.words)
+
+    def prefix(self, query, limit):
+        """规范化单词以 query 开头的位置，精确匹配在前，其余按单词长度、字母顺序，取前 limit 个"""
+        lo = bisect_left(self.keys, query)
+        hi = bisect_right(self.keys, query + '\U0010ffff', lo)
+        best = heapq.nsmallest(limit, range(lo, hi), key=lambda j: (len(self.keys[j]), self.keys[j]))
+        return [
+            (0 if len(self.keys[j]) == len(query) else 1 + len(self.keys[j]) - len(query), self.key_positions[j])
+            for j in best
+        ]
+
+    def chinese(self, runs, terms, limit):
+        """释义包含全部中文片段 runs 的位置，匹配位置越靠前、释义越短越靠前
+
+        terms 为查询中的其他部分（英文、数字等，已规范化），每个都必须是单词的前缀或出现在释义中。
+        """
+        grams = set()
+        for run in runs:
+            if len(run) == 1:
+                grams.add(run)
+            else:
+                grams.update(run[j:j + 2] for j in range(len(run) - 1))
+        lists = []
+        for gram in grams:
+            positions = self.postings.get(gram)
+            if positions is None:
+                return []
+            lists.append(positions)
+        lists.sort(key=len)
+
+        candidates = lists[0]
+        for other in lists[1:]:
+            other_set = set(other)
+            candidates = [i for i in candidates if i in other_set]
+
+        results = []
+        for i in candidates:
+            translation = self.translations[i]
+            offset = translation.find(runs[0])
+            if offset < 0 or not all(run in translation for run in runs[1:]):
+                continue
+            if terms:
+                word = normalize(self.words[i])
+                normalized = normalize(translation)
+                if not all(word.startswith(term) or term in normalized for term in terms):
+                    continue
+            results.append((offset * 10 + len(translation) / 100, i))
+        results.sort()
+        return results[:limit * 4]
+
+    def result(self, i, score, wordbook_name):
+        return {
+            'id': self.ids[i],
+            'wordbook_id': self.wordbook_id,
+            'wordbook_name': wordbook_name,
+            'sequence': self.orders[i],
+            'word': self.words[i],
+            'phonetic': self.phonetics[i],
+            'translation': self.translations[i],
+            'score': round(score, 3)
+        }
+
+
+def index_wordbook(wordbook_id, version, ids, words, start_order=1):
+    """导入时调用：用刚导入的 (word, phonetic, translation) 列表和按顺序排列的单词ID建立分段，
+    无需再读取单词内容"""
+    segment = IndexSegment(
+        wordbook_id,
+        version,
+        ids,
+        range(start_order, start_order + len(words)),
+        [word for word, _, _ in words],
+        [phonetic for _, phonetic, _ in words],
+        [translation for _, _, translation in words]
+    )
+    _store(segment)
+
+
+def _store(segment):
+    global _cached_words
+    with _lock:
+        old = _segments.pop(segment.wordbook_id, None)
+        if old is not None:
+            _cached_words -= len(old)
+        _segments[segment.wordbook_id] = segment
+        _cached_words += len(segment)
+
+        # 至少保留当前这本
+        while _cached_words > Config.SEARCH_INDEX_MAX_WORDS and len(_segments) > 1:
+            _, evicted = _segments.popitem(last=False)
+            _cached_words -= len(evicted)
+
+
+def drop_wordbook(wordbook_id):
+    """删除单词书后调用"""
+    global _cached_words
+    with _lock:
+        segment = _segments.pop(wordbook_id, None)
+        if segment is not None:
+            _cached_words -= len(segment)
+
+
+def _active_wordbooks():
+    catalog = get_catalog()
+    if catalog is None:
+        generation = current_generation()
+        catalog = [wb.to_dict() for wb in Wordbook.query.filter_by(is_active=True).order_by(Wordbook.id).all()]
+        set_catalog(catalog, generation)
+    return catalog
+
+
+def _segment(wordbook):
+    with _lock:
+        segment = _segments.get(wordbook['id'])
+        if segment is not None:
+            _segments.move_to_end(wordbook['id'])
+    if segment is not None and segment.version == wordbook['version']:
+        return segment
+
+    content = get_wordbook_content(wordbook['id'])
+    if content is None:
+        return None
+    segment = IndexSegment(
+        content.wordbook_id, content.version,
+        content.ids, content.orders, content.words, content.phonetics, content.translations
+    )
+    _store(segment)
+    return segment
+
+
+def search(query, limit=20):
+    """在所有已上架单词书中搜索，返回按得分排序的结果（得分越低越相关）"""
+    query = query.strip()
+    if not query:
+        return []
+
+    if _CJK.search(query):
+        # 中文部分按释义包含匹配，其余部分（英文、数字）作为附加条件，忽略标点和空格
+        runs = _cjk_runs(query)
+        terms = re.findall(r'\w+', normalize(_CJK_RUN.sub(' ', query)))
+        chinese = True
+    else:
+        query = normalize(query)
+        chinese = False
+        if not query:
+            return []
+
+    results = []
+    for wordbook in _active_wordbooks():
+        segment = _segment(wordbook)
+        if segment is None:
+            continue
+        matches = segment.chinese(runs, terms, limit) if chinese else segment.prefix(query, limit)
+        results.extend(segment.result(i, score, wordbook['name']) for score, i in matches)
+
+    results.sort(key=lambda item: (item['score'], item['word'].lower(), item['wordbook_id']))
+    return results[:limit]
@@ -0,0 +1,114 @@
+import gzip
+import json
+import logging
+import threading
+from collections import OrderedDict
+from sqlalchemy.exc import IntegrityError
+from ..extensions import db
+from ..models.wordbook_snapshot import WordbookSnapshot
+from .wordbook_cache import get_wordbook_content
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+# 最近使用的快照字节，避免每次都从数据库读取整块 BLOB
+MEMORY_ENTRIES = 16
+_lock = threading.Lock()
+_memory = OrderedDict()  # wordbook_id -> (version, data)
+
+
+def _deltas(values):
+    result = []
+    previous = 0
+    for value in values:
+        result.append(value - previous)
+        previous = value
+    return result
+
+
+def build_snapshot(content):
+    """把单词书内容编码为 gzip 压缩的列式 JSON
+
+    每列一个数组，不再为每个单词重复键名；id 和序号按差值编码（批量导入时基本都是 1）；
+    音标和释义放进共享字符串表，列中只存下标。
+    """
+    strings = []
+    string_index = {}
+
+    def intern(value):
+        value = value or ''
+        idx = string_index.get(value)
+        if idx is None:
+            idx = string_index[value] = len(strings)
+            strings.append(value)
+        return idx
+
+    payload = {
+        'format': SNAPSHOT_FORMAT,
+        'wordbook_id': content.wordbook_id,
+        'version': content.version,
+        'total_words': content.word_count,
+        'count': len(content),
+        'strings': strings,
+        'columns': {
+            'id': _deltas(content.ids),
+            'sequence': _deltas(content.orders),
+            'word': content.words,
+            'phonetic': [intern(value) for value in content.phonetics],
+            'translation': [intern(value) for value in content.translations]
+        }
+    }
+    raw = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return gzip.compress(raw, compresslevel=9)
+
+
+def _remember(wordbook_id, version, data):
+    with _lock:
+        _memory[wordbook_id] = (version, data)
+        _memory.move_to_end(wordbook_id)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def get_snapshot(wordbook_id):
+    """返回 (version, gzip 数据)，单词书不存在时返回 None
+
+    每个版本只生成一次并保存在 wordbook_snapshots 表中。
+    """
+    content = get_wordbook_content(wordbook_id)
+    if content is None:
+        return None
+
+    with _lock:
+        cached = _memory.get(wordbook_id)
+    if cached and cached[0] == content.version:
+        return cached
+
+    snapshot = WordbookSnapshot.query.get(wordbook_id)
+    if snapshot is None or snapshot.version != content.version:
+        data = build_snapshot(content)
+        try:
+            if snapshot is None:
+                db.session.add(WordbookSnapshot(wordbook_id=wordbook_id, version=content.version, data=data))
+            else:
+                snapshot.version = content.version
+                snapshot.data = data
+            db.session.commit()
+            logger.info(f'生成单词书 {wordbook_id} v{content.version} 快照，{len(content)} 个单词，{len(data)} 字节')
+        except IntegrityError:
+            # 其他进程同时生成了同一份快照
+            db.session.rollback()
+        result = (content.version, data)
+    else:
+        result = (snapshot.version, snapshot.data)
+
+    _remember(wordbook_id, *result)
+    return result
+
+
+def delete_snapshot(wordbook_id):
+    """删除单词书前调用，随当前事务一起提交"""
+    WordbookSnapshot.query.filter_by(wordbook_id=wordbook_id).delete()
+    with _lock:
+        _memory.pop(wordbook_id, None)
@@ -0,0 +1,26 @@
+import io
+import tempfile
+from flask import Request
+from ..config import Config
+
+
+class SpooledUploadRequest(Request):
+    """上传文件先写入内存缓冲区，超过 UPLOAD_SPOOL_MAX_BYTES 才落到匿名临时文件
+
+    Werkzeug 默认的阈值是 500KB，词库 PDF 基本都会落盘。
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=Config.UPLOAD_SPOOL_MAX_BYTES, mode='rb+')
+
+
+def detach_upload(file_storage):
+    """取出上传文件的缓冲区，交给请求结束后仍需读取它的调用方（如后台任务）
+
+    请求结束时 Werkzeug 会关闭 request.files 中的所有流，这里换上空流，
+    原缓冲区由调用方负责关闭。
+    """
+    stream = file_storage.stream
+    file_storage.stream = io.BytesIO()
+    stream.seek(0)
+    return stream
@@ -0,0 +1,52 @@
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from ..extensions import db
+
+# 各数据库方言的 INSERT 构造函数
+_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+    'mysql': mysql.insert,
+    'mariadb': mysql.insert,
+}
+
+
+def upsert(table, conflict_columns, update_columns=(), dialect=None):
+    """构造单条语句的插入或更新
+
+    SQLite / PostgreSQL 生成 INSERT ... ON CONFLICT，MySQL / MariaDB 生成
+    INSERT ... ON DUPLICATE KEY UPDATE。conflict_columns 必须对应表上的唯一约束；
+    冲突时用新值覆盖 update_columns，为空时忽略这一行（已存在则不做任何修改）。
+    MySQL 忽略冲突时使用 INSERT IGNORE，它同时会把外键、超长等错误降为警告，
+    调用方应事先校验数据。
+
+    返回的语句和普通 insert 一样执行，传入参数列表即为批量执行。
+    """
+    name = dialect or db.engine.dialect.name
+    insert = _INSERTS.get(name)
+    if insert is None:
+        raise NotImplementedError(f'不支持的数据库: {name}')
+
+    stmt = insert(table)
+    if name in ('mysql', 'mariadb'):
+        if update_columns:
+            return stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in update_columns})
+        # MySQL 没有 DO NOTHING；驱动开启了 CLIENT_FOUND_ROWS，把唯一键赋值为自身时影响行数也是 1，
+        # 无法区分插入和冲突，改用 INSERT IGNORE（冲突时影响行数为 0）
+        return stmt.prefix_with('IGNORE')
+
+    if update_columns:
+        return stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={column: stmt.excluded[column] for column in update_columns}
+        )
+    return stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+
+
+def was_inserted(result):
+    """单行 upsert 执行后，判断是否插入了新行
+
+    各数据库插入新行时影响行数都是 1；冲突时 SQLite / PostgreSQL 和 MySQL 的 INSERT IGNORE 为 0，
+    MySQL ON DUPLICATE KEY UPDATE 更新已有行为 2。不使用 lastrowid：MySQL 冲突时它仍可能是
+    预留的自增值。
+    """
+    return result.rowcount == 1
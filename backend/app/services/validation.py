@@ -0,0 +1,14 @@
+# 请求参数校验
+
+# 主键和外键列都是 Integer（MySQL INT），超出范围的值写入时会报错或溢出
+MAX_ID = 2 ** 31 - 1
+
+
+def is_int(value):
+    """是否为整数（JSON 中的 true / false 在 Python 中也是 int，需要排除）"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_valid_id(value):
+    """是否为合法的记录ID：正整数且不超过 Integer 列的范围"""
+    return is_int(value) and 1 <= value <= MAX_ID
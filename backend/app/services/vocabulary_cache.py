@@ -0,0 +1,153 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from ..config import Config
+from ..extensions import db
+from ..models.vocabulary import Vocabulary
+
+# 生词本总数的进程内缓存：(user_id, wordbook_id) -> (总数, 缓存时间)
+# 本进程添加、移除生词时立即失效；多进程部署时其他进程最多滞后 VOCABULARY_TOTAL_TTL 秒
+_lock = threading.Lock()
+_totals = {}
+# 超过后写入时顺便清理过期条目
+MAX_ENTRIES = 10000
+
+
+def get_total(user_id, wordbook_id, count):
+    """返回缓存的生词总数，未缓存或已过期时调用 count() 重新统计"""
+    key = (user_id, wordbook_id)
+    with _lock:
+        cached = _totals.get(key)
+    if cached and time.monotonic() - cached[1] < Config.VOCABULARY_TOTAL_TTL:
+        return cached[0]
+
+    total = count()
+    now = time.monotonic()
+    with _lock:
+        if len(_totals) >= MAX_ENTRIES:
+            for stale in [k for k, v in _totals.items() if now - v[1] >= Config.VOCABULARY_TOTAL_TTL]:
+                del _totals[stale]
+        _totals[key] = (total, now)
+    return total
+
+
+class VocabularyMembership:
+    """用户生词本中的单词ID，升序保存在 array 中，用二分查找判断是否存在"""
+
+    __slots__ = ('ids', 'loaded_at')
+
+    def __init__(self, word_ids):
+        self.ids = array('q', sorted(word_ids))
+        self.loaded_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, word_id):
+        i = bisect_left(self.ids, word_id)
+        return i < len(self.ids) and self.ids[i] == word_id
+
+    def flags(self, word_ids):
+        """批量判断，返回与 word_ids 对应的布尔列表"""
+        return [word_id in self for word_id in word_ids]
+
+    def add(self, word_id):
+        i = bisect_left(self.ids, word_id)
+        if i == len(self.ids) or self.ids[i] != word_id:
+            self.ids.insert(i, word_id)
+
+    def discard(self, word_id):
+        i = bisect_left(self.ids, word_id)
+        if i < len(self.ids) and self.ids[i] == word_id:
+            del self.ids[i]
+
+
+# user_id -> VocabularyMembership，按最近使用排序
+_memberships = OrderedDict()
+# 正在重新加载的用户：user_id -> {加载标记: 加载期间发生的修改}
+# 查询在锁外执行，期间提交的添加、移除记录在这里，加载完成后补到新集合上，不会被旧的查询结果覆盖
+_reloads = {}
+
+
+def get_membership(user_id):
+    """返回用户的生词本成员集合
+
+    首次使用时查询一次，之后由添加、移除接口原地更新；超过 VOCABULARY_MEMBERSHIP_TTL 秒
+    重新加载，使其他进程的修改最终可见。
+    """
+    with _lock:
+        membership = _memberships.get(user_id)
+        if membership is not None:
+            _memberships.move_to_end(user_id)
+    if membership is not None and time.monotonic() - membership.loaded_at < Config.VOCABULARY_MEMBERSHIP_TTL:
+        return membership
+
+    token = object()
+    with _lock:
+        _reloads.setdefault(user_id, {})[token] = changes = []
+    try:
+        rows = db.session.query(Vocabulary.word_id).filter(Vocabulary.user_id == user_id).all()
+    finally:
+        with _lock:
+            pending = _reloads[user_id]
+            del pending[token]
+            if not pending:
+                del _reloads[user_id]
+
+    membership = VocabularyMembership(word_id for word_id, in rows)
+    with _lock:
+        for added, word_ids in changes:
+            if added is None:
+                # 加载期间整体失效，查询结果可能已经过时，只用于本次请求
+                return membership
+            for word_id in word_ids:
+                if added:
+                    membership.add(word_id)
+                else:
+                    membership.discard(word_id)
+        _memberships[user_id] = membership
+        while len(_memberships) > Config.VOCABULARY_MEMBERSHIP_MAX_USERS:
+            _memberships.popitem(last=False)
+    return membership
+
+
+def _record_reloading(user_id, change):
+    for changes in _reloads.get(user_id, {}).values():
+        changes.append(change)
+
+
+def record_added(user_id, word_ids):
+    """提交添加生词后调用"""
+    with _lock:
+        _drop_totals(user_id)
+        _record_reloading(user_id, (True, word_ids))
+        membership = _memberships.get(user_id)
+        if membership is not None:
+            for word_id in word_ids:
+                membership.add(word_id)
+
+
+def record_removed(user_id, word_ids):
+    """提交移除生词后调用"""
+    with _lock:
+        _drop_totals(user_id)
+        _record_reloading(user_id, (False, word_ids))
+        membership = _memberships.get(user_id)
+        if membership is not None:
+            for word_id in word_ids:
+                membership.discard(word_id)
+
+
+def invalidate_vocabulary(user_id):
+    """用户的生词本发生无法逐个记录的变化（如按单词书清空）后调用"""
+    with _lock:
+        _drop_totals(user_id)
+        _record_reloading(user_id, (None, None))
+        _memberships.pop(user_id, None)
+
+
+def _drop_totals(user_id):
+    for key in [key for key in _totals if key[0] == user_id]:
+        del _totals[key]
@@ -0,0 +1,107 @@
+import logging
+import time
+from datetime import datetime
+from ..extensions import db
+from ..models.word import Word
+from ..models.wordbook import Wordbook
+from .catalog_cache import invalidate_catalog
+from .admin_stats import adjust_stats
+from .search_index import index_wordbook
+from .lexicon import resolve_lexemes
+
+logger = logging.getLogger(__name__)
+
+# 每批 executemany 携带的行数
+# 驱动会把一批参数改写成多行 INSERT（insertmanyvalues / PyMySQL executemany），
+# SQLite 受绑定参数上限约束（旧版本为 999，每行 4 个参数），
+# MySQL / PostgreSQL 主要受 max_allowed_packet 和语句大小约束
+CHUNK_SIZES = {
+    'sqlite': 240,
+    'mysql': 1000,
+    'mariadb': 1000,
+    'postgresql': 1000,
+}
+DEFAULT_CHUNK_SIZE = 500
+
+
+def get_chunk_size(bind=None):
+    """根据数据库后端返回每批插入的行数"""
+    bind = bind or db.session.get_bind()
+    return CHUNK_SIZES.get(bind.dialect.name, DEFAULT_CHUNK_SIZE)
+
+
+def bulk_insert_words(wordbook_id, words, start_order=1, chunk_size=None, progress=None):
+    """分批批量插入单词，words 为 (word, phonetic, translation) 序列
+
+    先按内容摘要把单词解析为共享词条（已有的复用），再用 Core insert() 分批 executemany
+    写入 (wordbook_id, sort_order, lexeme_id)，不创建 ORM 对象也不回读主键，
+    由调用方负责提交事务。每插入一批调用一次 progress(已插入行数)。
+    返回插入统计信息。
+    """
+    chunk_size = chunk_size or get_chunk_size()
+    table = Word.__table__
+    created_at = datetime.utcnow()
+
+    started = time.perf_counter()
+    lexeme_ids, new_lexemes = resolve_lexemes(words)
+    inserted = 0
+    chunk = []
+
+    for idx, lexeme_id in enumerate(lexeme_ids, start_order):
+        chunk.append({
+            'wordbook_id': wordbook_id,
+            'lexeme_id': lexeme_id,
+            'sort_order': idx,
+            'created_at': created_at
+        })
+        if len(chunk) >= chunk_size:
+            db.session.execute(table.insert(), chunk)
+            inserted += len(chunk)
+            chunk = []
+            if progress:
+                progress(inserted)
+
+    if chunk:
+        db.session.execute(table.insert(), chunk)
+        inserted += len(chunk)
+        if progress:
+            progress(inserted)
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        'rows': inserted,
+        'new_lexemes': new_lexemes,
+        'seconds': round(elapsed, 4),
+        'rows_per_sec': round(inserted / elapsed, 1) if elapsed > 0 else None,
+        'chunk_size': chunk_size
+    }
+    logger.info(f'词库 {wordbook_id} 批量插入 {inserted} 个单词（新增词条 {new_lexemes} 个），'
+                f'耗时 {elapsed:.3f}s，{stats["rows_per_sec"]} 行/秒')
+    return stats
+
+
+def import_wordbook(name, words, is_active=False, chunk_size=None, progress=None):
+    """创建单词书并批量导入单词，在一个事务中完成
+
+    成功返回 (wordbook, stats)，失败时回滚并抛出异常。
+    """
+    try:
+        wordbook = Wordbook(name=name, word_count=len(words), is_active=is_active)
+        db.session.add(wordbook)
+        db.session.flush()
+        wordbook_id, version = wordbook.id, wordbook.version
+
+        stats = bulk_insert_words(wordbook.id, words, chunk_size=chunk_size, progress=progress)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if is_active:
+        invalidate_catalog()
+        # 已上架的单词书直接用内存中的单词建立搜索索引（只需按顺序查出单词ID）；未上架的在上架后首次搜索时建立
+        ids = db.session.query(Word.id).filter(Word.wordbook_id == wordbook_id).order_by(Word.sort_order).all()
+        index_wordbook(wordbook_id, version, [word_id for word_id, in ids], words)
+    adjust_stats(total_wordbooks=1, active_wordbooks=int(is_active), total_words=stats['rows'])
+
+    return wordbook, stats
@@ -0,0 +1,151 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from ..config import Config
+from ..extensions import db
+from ..models.word import Word
+from ..models.lexeme import Lexeme
+from ..models.wordbook import Wordbook
+
+
+class WordbookContent:
+    """单词书内容的紧凑表示
+
+    按 sort_order 排列的并行数组：整数列用 array，字符串列用 list，
+    不为每个单词创建 ORM 对象或字典。
+    """
+
+    __slots__ = ('wordbook_id', 'version', 'word_count', 'orders', 'ids',
+                 'words', 'phonetics', 'translations', 'checked_at')
+
+    def __init__(self, wordbook_id, version, word_count, rows):
+        self.wordbook_id = wordbook_id
+        self.version = version
+        self.word_count = word_count
+        self.orders = array('l')
+        self.ids = array('q')
+        self.words = []
+        self.phonetics = []
+        self.translations = []
+        for word_id, sort_order, word, phonetic, translation in rows:
+            self.ids.append(word_id)
+            self.orders.append(sort_order)
+            self.words.append(word)
+            self.phonetics.append(phonetic)
+            self.translations.append(translation)
+        self.checked_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _to_dict(self, i):
+        return {
+            'id': self.ids[i],
+            'wordbook_id': self.wordbook_id,
+            'word': self.words[i],
+            'phonetic': self.phonetics[i],
+            'translation': self.translations[i],
+            'sequence': self.orders[i]
+        }
+
+    def get(self, sequence):
+        """按 sort_order 取单词，返回与 Word.to_dict() 相同的字典"""
+        i = bisect_left(self.orders, sequence)
+        if i < len(self.orders) and self.orders[i] == sequence:
+            return self._to_dict(i)
+        return None
+
+    def range(self, start, limit):
+        """取 sort_order 在 [start, start + limit) 内的单词"""
+        lo = bisect_left(self.orders, start)
+        hi = bisect_left(self.orders, start + limit)
+        return [self._to_dict(i) for i in range(lo, hi)]
+
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # wordbook_id -> WordbookContent，按最近使用排序
+_cached_words = 0
+
+
+def _load(wordbook_id):
+    wordbook = db.session.query(Wordbook.version, Wordbook.word_count).filter(
+        Wordbook.id == wordbook_id, Wordbook.deleted_at.is_(None)
+    ).first()
+    if not wordbook:
+        return None
+
+    rows = db.session.query(
+        Word.id, Word.sort_order, Lexeme.word, Lexeme.phonetic, Lexeme.translation
+    ).join(Lexeme, Lexeme.id == Word.lexeme_id).filter(
+        Word.wordbook_id == wordbook_id
+    ).order_by(Word.sort_order).all()
+    return WordbookContent(wordbook_id, wordbook.version, wordbook.word_count, rows)
+
+
+def _store(content):
+    global _cached_words
+    with _lock:
+        old = _entries.pop(content.wordbook_id, None)
+        if old is not None:
+            _cached_words -= len(old)
+        _entries[content.wordbook_id] = content
+        _cached_words += len(content)
+
+        # 按单词总数限制内存，淘汰最久未使用的单词书（至少保留当前这本）
+        while _cached_words > Config.WORDBOOK_CACHE_MAX_WORDS and len(_entries) > 1:
+            _, evicted = _entries.popitem(last=False)
+            _cached_words -= len(evicted)
+
+
+def get_wordbook_content(wordbook_id):
+    """返回单词书内容，单词书不存在时返回 None
+
+    缓存在 WORDBOOK_CACHE_REVALIDATE 秒内直接使用，不访问数据库；
+    超过后只查询一次版本号，版本未变则继续使用。
+    """
+    with _lock:
+        content = _entries.get(wordbook_id)
+        if content is not None:
+            _entries.move_to_end(wordbook_id)
+
+    if content is not None:
+        if time.monotonic() - content.checked_at < Config.WORDBOOK_CACHE_REVALIDATE:
+            return content
+
+        version = db.session.query(Wordbook.version).filter(Wordbook.id == wordbook_id).scalar()
+        if version == content.version:
+            content.checked_at = time.monotonic()
+            return content
+
+    content = _load(wordbook_id)
+    if content is None:
+        invalidate_wordbook(wordbook_id)
+        return None
+
+    _store(content)
+    return content
+
+
+def peek_version(wordbook_id):
+    """返回本进程缓存中仍在确认期内的版本号，不访问数据库；没有时返回 None"""
+    with _lock:
+        content = _entries.get(wordbook_id)
+    if content is not None and time.monotonic() - content.checked_at < Config.WORDBOOK_CACHE_REVALIDATE:
+        return content.version
+    return None
+
+
+def bump_version(wordbook):
+    """单词书内容或状态变化时调用，随当前事务一起提交"""
+    wordbook.version = Wordbook.version + 1
+
+
+def invalidate_wordbook(wordbook_id):
+    """丢弃本进程的缓存，提交修改后调用"""
+    global _cached_words
+    with _lock:
+        content = _entries.pop(wordbook_id, None)
+        if content is not None:
+            _cached_words -= len(content)
@@ -0,0 +1,107 @@
+import atexit
+import logging
+import threading
+import time
+from sqlalchemy.exc import InterfaceError, OperationalError
+from ..extensions import db
+
+logger = logging.getLogger(__name__)
+
+# 延迟写入缓冲（学习进度、学习事件）共用的写入和定时刷新逻辑
+
+# 一行因临时错误（数据库不可用、锁超时）写入失败后最多放回缓冲的次数
+MAX_ROW_ATTEMPTS = 5
+# 逐行重试时连续遇到这么多次临时错误，认为数据库不可用，其余行不再逐行尝试
+MAX_TRANSIENT_FAILURES = 3
+
+
+def _is_transient(error):
+    return isinstance(error, (OperationalError, InterfaceError))
+
+
+def write_rows(execute, rows, what):
+    """写入一批缓冲的行，返回 (写入条数, 应放回缓冲的行)
+
+    execute(conn, rows) 在一个事务中写入。先整批写入；因数据本身失败时改为逐行写入，
+    仍然失败的行（违反约束、超出范围等）记录日志后丢弃，不会阻塞其他行。
+    数据库不可用等临时错误的行原样返回，由调用方放回缓冲。
+    """
+    try:
+        with db.engine.begin() as conn:
+            execute(conn, rows)
+        return len(rows), []
+    except Exception as e:
+        if _is_transient(e):
+            logger.error(f'写入{what}失败，稍后重试: {e}')
+            return 0, list(rows)
+        logger.warning(f'批量写入{what}失败，改为逐行写入: {e}')
+
+    written = 0
+    retry = []
+    transient_failures = 0
+    for i, row in enumerate(rows):
+        if transient_failures >= MAX_TRANSIENT_FAILURES:
+            retry.extend(rows[i:])
+            break
+        try:
+            with db.engine.begin() as conn:
+                execute(conn, [row])
+            written += 1
+        except Exception as e:
+            if _is_transient(e):
+                transient_failures += 1
+                retry.append(row)
+            else:
+                logger.error(f'丢弃无法写入的{what} {row}: {e}')
+    return written, retry
+
+
+class RetryCounter:
+    """记录每行因临时错误写入失败的次数，超过 MAX_ROW_ATTEMPTS 后不再放回缓冲"""
+
+    def __init__(self, key, what):
+        self._key = key
+        self._what = what
+        self._counts = {}
+
+    def requeue(self, rows):
+        """返回还可以放回缓冲的行"""
+        kept = []
+        for row in rows:
+            key = self._key(row)
+            attempts = self._counts.get(key, 0) + 1
+            if attempts >= MAX_ROW_ATTEMPTS:
+                self._counts.pop(key, None)
+                logger.error(f'{self._what} {row} 已重试 {attempts} 次，丢弃')
+            else:
+                self._counts[key] = attempts
+                kept.append(row)
+        return kept
+
+    def forget(self, rows):
+        """已写入或被新数据取代的行"""
+        for row in rows:
+            self._counts.pop(self._key(row), None)
+
+
+def start_flusher(app, name, interval, has_pending, flush):
+    """启动定时写入线程，并注册进程退出时写入
+
+    interval() 返回刷新间隔（秒），每次循环重新读取。
+    """
+    def loop():
+        while True:
+            time.sleep(interval())
+            if has_pending():
+                with app.app_context():
+                    flush()
+
+    def at_exit():
+        if has_pending():
+            with app.app_context():
+                flush()
+
+    thread = threading.Thread(target=loop, name=name, daemon=True)
+    thread.start()
+    atexit.register(at_exit)
+    return thread
@@ -0,0 +1,76 @@
+"""Excel 解析性能测试
+
+生成合成的 3 列词表（序号、英文 [音标]、中文），测量流式解析在不同行数下的耗时，
+验证耗时随行数线性增长。小规模下同时对比旧的逐行 iter_rows(min_row=i, max_row=i) 写法。
+
+用法（在 backend 目录下运行）：
+    python benchmarks/bench_excel_parser.py
+    python benchmarks/bench_excel_parser.py --rows 10000 20000 50000 --legacy-max 4000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openpyxl
+from app.services.excel_parser import parse_excel
+
+
+def make_sheet(path, rows):
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for i in range(1, rows + 1):
+        sheet.append([i, f'word{i} [wɜːd{i}]', f'n. 单词{i}；释义'])
+    workbook.save(path)
+
+
+def legacy_scan(path, rows):
+    """旧实现的行遍历方式：每行调用一次 iter_rows，只读模式下每次都重新扫描 XML"""
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    sheet = workbook.active
+    count = 0
+    # write_only 生成的文件没有 dimension 信息，sheet.max_row 为 None，这里直接用已知行数
+    for row_idx in range(1, rows + 1):
+        list(sheet.iter_rows(min_row=row_idx, max_row=row_idx, values_only=True))
+        count += 1
+    workbook.close()
+    return count
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Excel 解析性能测试')
+    parser.add_argument('--rows', type=int, nargs='+', default=[5000, 10000, 20000, 50000])
+    parser.add_argument('--legacy-max', type=int, default=1000,
+                        help='旧实现只在不超过该行数时测试（二次复杂度）')
+    args = parser.parse_args()
+
+    sizes = sorted(set(args.rows + [n for n in (500, 1000, 2000) if n <= args.legacy_max]))
+
+    print(f'{"行数":>8} {"流式(s)":>10} {"us/行":>8} {"旧实现(s)":>10}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f'synthetic_{rows}.xlsx')
+            make_sheet(path, rows)
+
+            elapsed, words = timed(parse_excel, path)
+            assert len(words) == rows, f'期望 {rows} 个单词，实际 {len(words)}'
+
+            legacy = ''
+            if rows <= args.legacy_max:
+                legacy_elapsed, _ = timed(legacy_scan, path, rows)
+                legacy = f'{legacy_elapsed:10.3f}'
+
+            print(f'{rows:>8} {elapsed:10.3f} {elapsed / rows * 1e6:8.1f} {legacy:>10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""共享词条表（lexemes）存储和查询性能测试
+
+把 单词库/ 下的每个 PDF 作为一本单词书导入两个 SQLite 库：
+- 旧结构：words 表每行自带 word / phonetic / translation
+- 新结构：words 只存 (wordbook_id, sort_order, lexeme_id)，内容按摘要去重存入 lexemes
+对比行数、数据库文件大小、导入耗时，以及整本加载、按序号范围读取、按ID取单词的查询耗时。
+
+用法（在 backend 目录下运行）：
+    python benchmarks/bench_lexicon.py
+    python benchmarks/bench_lexicon.py --repeat 5
+"""
+import argparse
+import glob
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, Text, UniqueConstraint, text
+from app.extensions import db
+from app.models import Lexeme, Wordbook
+from app.services.PDF_reader import extract_words_from_pdf
+from app.services.word_importer import bulk_insert_words
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '单词库')
+
+# 旧结构的 words 表
+legacy_metadata = MetaData()
+legacy_words = Table(
+    'words', legacy_metadata,
+    Column('id', Integer, primary_key=True),
+    Column('wordbook_id', Integer, nullable=False),
+    Column('word', String(100), nullable=False),
+    Column('phonetic', String(100)),
+    Column('translation', Text, nullable=False),
+    Column('sort_order', Integer, nullable=False),
+    Column('created_at', DateTime),
+    UniqueConstraint('wordbook_id', 'sort_order', name='unique_wordbook_sequence'),
+    Index('idx_wordbook_sequence', 'wordbook_id', 'sort_order'),
+)
+
+LEGACY_QUERIES = {
+    'book': 'SELECT id, sort_order, word, phonetic, translation FROM words WHERE wordbook_id = :wordbook_id ORDER BY sort_order',
+    'range': 'SELECT sort_order, word, phonetic, translation, created_at FROM words '
+             'WHERE wordbook_id = :wordbook_id AND sort_order >= :start AND sort_order < :end ORDER BY sort_order',
+    'by_id': 'SELECT id, wordbook_id, word, phonetic, translation, sort_order FROM words WHERE id = :id',
+}
+LEXEME_QUERIES = {
+    'book': 'SELECT w.id, w.sort_order, l.word, l.phonetic, l.translation FROM words w '
+            'JOIN lexemes l ON l.id = w.lexeme_id WHERE w.wordbook_id = :wordbook_id ORDER BY w.sort_order',
+    'range': 'SELECT w.sort_order, l.word, l.phonetic, l.translation, w.created_at FROM words w '
+             'JOIN lexemes l ON l.id = w.lexeme_id '
+             'WHERE w.wordbook_id = :wordbook_id AND w.sort_order >= :start AND w.sort_order < :end ORDER BY w.sort_order',
+    'by_id': 'SELECT w.id, w.wordbook_id, l.word, l.phonetic, l.translation, w.sort_order FROM words w '
+             'JOIN lexemes l ON l.id = w.lexeme_id WHERE w.id = :id',
+}
+
+
+def load_corpus(repeat):
+    books = []
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, '*.pdf'))):
+        books.append((os.path.basename(path), extract_words_from_pdf(path)))
+    print(f'解析 {len(books)} 个 PDF，共 {sum(len(words) for _, words in books)} 个单词')
+    return books * repeat
+
+
+def make_app(url):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def import_legacy(books):
+    created_at = datetime.utcnow()
+    for wordbook_id, (_, words) in enumerate(books, 1):
+        db.session.execute(legacy_words.insert(), [
+            {'wordbook_id': wordbook_id, 'word': word, 'phonetic': phonetic, 'translation': translation,
+             'sort_order': idx, 'created_at': created_at}
+            for idx, (word, phonetic, translation) in enumerate(words, 1)
+        ])
+    db.session.commit()
+
+
+def import_lexemes(books):
+    for name, words in books:
+        wordbook = Wordbook(name=name, word_count=len(words))
+        db.session.add(wordbook)
+        db.session.flush()
+        bulk_insert_words(wordbook.id, words)
+    db.session.commit()
+
+
+def time_queries(queries, books, samples):
+    rng = random.Random(7)
+    max_id = db.session.execute(text('SELECT MAX(id) FROM words')).scalar()
+    params = {
+        'book': lambda: {'wordbook_id': rng.randint(1, len(books))},
+        'range': lambda: dict(zip(('wordbook_id', 'start'), (rng.randint(1, len(books)), rng.randint(1, 200))),
+                              end=0),
+        'by_id': lambda: {'id': rng.randint(1, max_id)},
+    }
+    results = {}
+    for name, sql in queries.items():
+        statement = text(sql)
+        timings = []
+        for _ in range(samples):
+            values = params[name]()
+            if name == 'range':
+                values['end'] = values['start'] + 200
+            started = time.perf_counter()
+            db.session.execute(statement, values).all()
+            timings.append((time.perf_counter() - started) * 1000)
+        results[name] = statistics.median(timings)
+    return results
+
+
+def run(label, path, books, samples):
+    app = make_app(f'sqlite:///{path}')
+    with app.app_context():
+        started = time.perf_counter()
+        if label == 'legacy':
+            legacy_metadata.create_all(db.engine)
+            import_legacy(books)
+            queries = LEGACY_QUERIES
+        else:
+            db.create_all()
+            import_lexemes(books)
+            queries = LEXEME_QUERIES
+        elapsed = time.perf_counter() - started
+
+        words = db.session.execute(text('SELECT COUNT(*) FROM words')).scalar()
+        lexemes = db.session.query(Lexeme).count() if label == 'lexeme' else None
+        timings = time_queries(queries, books, samples)
+        db.session.execute(text('VACUUM'))
+        db.session.remove()
+        db.engine.dispose()
+
+    size = os.path.getsize(path) / 1024
+    print(f'  [{label:<6}] words {words:>7} 行  lexemes {lexemes if lexemes is not None else "-":>7}  '
+          f'文件 {size:9.0f}KB  导入 {elapsed:6.2f}s')
+    print(f'  [{label:<6}] 整本加载 {timings["book"]:7.3f}ms  范围 200 {timings["range"]:7.3f}ms  '
+          f'按ID {timings["by_id"]:7.3f}ms')
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='共享词条表存储和查询性能测试')
+    parser.add_argument('--repeat', type=int, default=1, help='语料重复导入的次数，模拟更多相互重叠的单词书')
+    parser.add_argument('--samples', type=int, default=200, help='每种查询的次数')
+    args = parser.parse_args()
+
+    books = load_corpus(args.repeat)
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = run('legacy', os.path.join(tmp, 'legacy.db'), books, args.samples)
+        lexeme = run('lexeme', os.path.join(tmp, 'lexeme.db'), books, args.samples)
+    print(f'  文件大小 {lexeme / legacy:.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""密码哈希性能测试
+
+对不同的 bcrypt 强度，测量：
+- 单线程每秒可完成的登录校验次数（即每核每秒登录数）
+- 经线程池（PASSWORD_HASH_WORKERS 个线程）并发校验时的总吞吐
+- 突发请求超过排队上限时被拒绝（登录接口返回 503）的数量
+
+用法（在 backend 目录下运行）：
+    python benchmarks/bench_password.py
+    python benchmarks/bench_password.py --rounds 10 12 13 --burst 200
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Config
+from app.services import passwords
+from app.services.passwords import PasswordHasherBusy, check_password, hash_password
+
+
+def reset_pool():
+    """按当前 Config 重新创建线程池"""
+    if passwords._executor is not None:
+        passwords._executor.shutdown()
+    passwords._executor = None
+    passwords._slots = None
+
+
+def single_thread(password_hash, seconds):
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        check_password(password_hash, 'secret1')
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def burst(password_hash, requests):
+    """模拟 requests 个请求线程同时登录"""
+    def login(_):
+        try:
+            return check_password(password_hash, 'secret1')
+        except PasswordHasherBusy:
+            return None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=requests) as clients:
+        results = list(clients.map(login, range(requests)))
+    elapsed = time.perf_counter() - started
+    accepted = sum(1 for result in results if result is not None)
+    return accepted / elapsed, requests - accepted, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='密码哈希性能测试')
+    parser.add_argument('--rounds', type=int, nargs='+', default=[10, 11, 12], help='要测试的 bcrypt 强度')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='哈希线程数')
+    parser.add_argument('--queue', type=int, default=Config.PASSWORD_HASH_QUEUE_MAX, help='允许排队的任务数')
+    parser.add_argument('--burst', type=int, default=100, help='同时发起的登录数')
+    parser.add_argument('--seconds', type=float, default=2, help='单线程测试时长')
+    args = parser.parse_args()
+
+    Config.PASSWORD_HASH_WORKERS = args.workers
+    Config.PASSWORD_HASH_QUEUE_MAX = args.queue
+    print(f'CPU 核数 {os.cpu_count()}，哈希线程 {args.workers}，排队上限 {args.queue}，突发 {args.burst} 个登录')
+
+    for rounds in args.rounds:
+        Config.BCRYPT_LOG_ROUNDS = rounds
+        reset_pool()
+        password_hash = hash_password('secret1')
+
+        per_core = single_thread(password_hash, args.seconds)
+        throughput, rejected, elapsed = burst(password_hash, args.burst)
+        print(f'  cost={rounds:<2}  单核 {per_core:7.1f} 次/秒  '
+              f'线程池 {throughput:7.1f} 次/秒（每核 {throughput / min(args.workers, os.cpu_count() or 1):6.1f}）  '
+              f'突发拒绝 {rejected:>4}/{args.burst}  耗时 {elapsed:5.2f}s')
+
+    reset_pool()
+
+
+if __name__ == '__main__':
+    main()
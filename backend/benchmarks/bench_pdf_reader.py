@@ -0,0 +1,60 @@
+"""PDF 解析性能测试
+
+对 单词库/ 下的每个 PDF 分别做串行和并行解析，对比耗时并校验结果完全一致。
+
+用法（在 backend 目录下运行）：
+    python benchmarks/bench_pdf_reader.py
+    python benchmarks/bench_pdf_reader.py --workers 2 4 --files 中英都有（有音标）.pdf
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.PDF_reader import extract_words_from_pdf
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '单词库')
+
+
+def timed(pdf_path, workers):
+    started = time.perf_counter()
+    words = extract_words_from_pdf(pdf_path, workers=workers)
+    return time.perf_counter() - started, words
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PDF 解析性能测试')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, os.cpu_count() or 2])
+    parser.add_argument('--files', nargs='+', default=None, help='只测试指定文件名')
+    args = parser.parse_args()
+
+    if args.files:
+        paths = [os.path.join(CORPUS_DIR, name) for name in args.files]
+    else:
+        paths = sorted(glob.glob(os.path.join(CORPUS_DIR, '*.pdf')))
+
+    workers_list = sorted(set(w for w in args.workers if w > 1))
+    header = f'{"文件":<28} {"单词":>6} {"串行(s)":>9}' + ''.join(f' {f"{w}进程(s)":>10}' for w in workers_list)
+    print(header)
+
+    totals = {w: 0.0 for w in [1] + workers_list}
+    for path in paths:
+        serial_elapsed, serial_words = timed(path, 1)
+        totals[1] += serial_elapsed
+        line = f'{os.path.basename(path):<28} {len(serial_words):>6} {serial_elapsed:9.2f}'
+
+        for workers in workers_list:
+            elapsed, words = timed(path, workers)
+            assert words == serial_words, f'{path}: {workers} 进程结果与串行不一致'
+            totals[workers] += elapsed
+            line += f' {elapsed:10.2f}'
+        print(line)
+
+    print(f'{"合计":<28} {"":>6} {totals[1]:9.2f}' + ''.join(f' {totals[w]:10.2f}' for w in workers_list))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Config 在导入时读取环境变量，必须在导入 app 之前设置
+_tmp = tempfile.mkdtemp(prefix='word-learning-test-')
+os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(_tmp, "test.db")}'
+os.environ['PURGE_ASYNC'] = '0'
+os.environ['IMPORT_ASYNC'] = '0'
+os.environ['BCRYPT_LOG_ROUNDS'] = '4'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def app():
+    # 上传目录是相对路径，放到临时目录下
+    cwd = os.getcwd()
+    os.chdir(_tmp)
+    try:
+        app = create_app()
+    finally:
+        os.chdir(cwd)
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def user_client(app):
+    """返回一个已登录普通用户的测试客户端，每次调用注册一个新用户"""
+    count = [0]
+
+    def make(name=None):
+        count[0] += 1
+        name = name or f'user{id(count)}_{count[0]}'
+        client = app.test_client()
+        client.post('/api/auth/register', json={
+            'username': name, 'email': f'{name}@example.com', 'password': 'secret1'
+        })
+        token = client.post('/api/auth/login', json={
+            'email': f'{name}@example.com', 'password': 'secret1'
+        }).json['access_token']
+        client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        return client
+
+    return make
+
+
+@pytest.fixture
+def admin_client(app):
+    """已登录主管理员的测试客户端（管理后台用 cookie 保存令牌）"""
+    client = app.test_client()
+    response = client.post('/admin/login', json={'username': 'Haocheng.Tang', 'password': 'Aa050213'})
+    assert response.status_code == 200
+    return client
+
+
+@pytest.fixture
+def make_wordbook(app):
+    """导入一本单词书并返回其ID，words 默认为 w1..wN"""
+    count = [0]
+
+    def make(words=10, is_active=True):
+        from app.services.word_importer import import_wordbook
+        count[0] += 1
+        if isinstance(words, int):
+            words = [(f'w{i}', '', f'释义{i}') for i in range(1, words + 1)]
+        with app.app_context():
+            wordbook, _ = import_wordbook(f'book{id(count)}_{count[0]}', words, is_active=is_active)
+            return wordbook.id
+
+    return make
+
+
+@pytest.fixture
+def statements(app):
+    """记录执行的 SQL 语句"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.models.study_event import StudyEvent
+from app.services.event_buffer import flush_events, record_events
+
+
+def _event(**overrides):
+    return {'word_id': 1, 'action': 'studied', 'timestamp': 1700000000000, **overrides}
+
+
+@pytest.mark.parametrize('event', [
+    _event(word_id=True),
+    _event(word_id=0),
+    _event(word_id=2**31),
+    _event(word_id='1'),
+    _event(wordbook_id=False),
+    _event(action='danced'),
+    _event(timestamp=True),
+    _event(timestamp='yesterday'),
+    'studied',
+])
+def test_invalid_events_are_rejected(app, user_client, event):
+    client = user_client()
+    response = client.post('/api/events', json={'events': [_event(), event]})
+    assert response.status_code == 400
+    assert client.get('/api/events/summary').json['summary'] == []
+
+
+def test_events_are_counted_after_flush(app, user_client):
+    client = user_client()
+    now = datetime.utcnow().isoformat() + 'Z'
+    events = [_event(word_id=n, timestamp=now, wordbook_id=1) for n in range(1, 4)] + [_event(action='known', timestamp=now)]
+    response = client.post('/api/events', json={'events': events})
+    assert response.status_code == 202
+    assert response.json['accepted'] == 4
+
+    summary = client.get('/api/events/summary', query_string={'days': 1}).json['summary']
+    assert {row['action']: row['count'] for row in summary} == {'studied': 3, 'known': 1}
+
+
+def test_unwritable_event_does_not_block_others(app):
+    now = datetime.utcnow()
+    good = {'user_id': 999001, 'word_id': 1, 'wordbook_id': None, 'action': 'studied', 'occurred_at': now, 'received_at': now}
+    # 违反非空约束，整批写入失败后逐行写入，只丢弃这一条
+    bad = {**good, 'action': None}
+
+    with app.app_context():
+        flush_events()
+        record_events([good, bad, {**good, 'word_id': 2}])
+        flush_events()
+        assert StudyEvent.query.filter_by(user_id=999001).count() == 2
+        # 被丢弃的事件不会放回缓冲
+        assert flush_events() == 0
+        db.session.remove()
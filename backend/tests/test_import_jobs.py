@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+
+from app.config import Config
+from app.extensions import db
+from app.models.import_job import ImportJob
+from app.services.import_jobs import init_import_jobs
+
+
+def _add_job(job_id, phase, age_days=0, finished=False):
+    created_at = datetime.utcnow() - timedelta(days=age_days, seconds=1)
+    db.session.add(ImportJob(
+        id=job_id, name=job_id, kind='pdf', phase=phase, created_at=created_at,
+        finished_at=created_at if finished else None
+    ))
+    db.session.commit()
+
+
+def test_startup_fails_interrupted_and_drops_expired_jobs(app):
+    with app.app_context():
+        _add_job('interrupted-queued', 'queued')
+        _add_job('interrupted-parsing', 'parsing')
+        _add_job('recent-done', 'done', finished=True)
+        _add_job('expired-done', 'done', age_days=Config.IMPORT_JOB_RETENTION_DAYS + 1, finished=True)
+        _add_job('expired-failed', 'failed', age_days=Config.IMPORT_JOB_RETENTION_DAYS + 1, finished=True)
+
+    init_import_jobs(app)
+
+    with app.app_context():
+        for job_id in ('interrupted-queued', 'interrupted-parsing'):
+            job = db.session.get(ImportJob, job_id)
+            assert job.phase == 'failed'
+            assert job.finished_at is not None
+        assert db.session.get(ImportJob, 'recent-done').phase == 'done'
+        assert db.session.get(ImportJob, 'expired-done') is None
+        assert db.session.get(ImportJob, 'expired-failed') is None
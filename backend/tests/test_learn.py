@@ -0,0 +1,50 @@
+import pytest
+
+from app.models import UserProgress
+
+
+@pytest.mark.parametrize('body', [
+    {'index': True},
+    {'index': False},
+    {'step': True},
+    {'index': 1, 'prefetch': True},
+    {'index': 1, 'prefetch': -1},
+    {'index': 0},
+    {'index': -3},
+    {'index': 11},
+    {'index': 2 ** 70},
+    {'index': '2'},
+    {},
+])
+def test_advance_rejects_invalid_input(app, user_client, make_wordbook, body):
+    wordbook_id = make_wordbook(10)
+    client = user_client()
+
+    response = client.post(f'/api/learn/{wordbook_id}/advance', json=body)
+    assert response.status_code == 400
+
+    with app.app_context():
+        assert UserProgress.query.filter_by(wordbook_id=wordbook_id).count() == 0
+
+
+def test_advance_moves_and_clamps(user_client, make_wordbook):
+    wordbook_id = make_wordbook(10)
+    client = user_client()
+
+    data = client.post(f'/api/learn/{wordbook_id}/advance', json={'index': 3, 'prefetch': 2}).json
+    assert data['current_index'] == 3
+    assert data['word']['word'] == 'w3'
+    assert [word['word'] for word in data['prefetch']] == ['w4', 'w5']
+
+    assert client.post(f'/api/learn/{wordbook_id}/advance', json={'step': -1}).json['current_index'] == 2
+    assert client.post(f'/api/learn/{wordbook_id}/advance', json={'step': 100}).json['current_index'] == 10
+    assert client.get(f'/api/progress/{wordbook_id}').json['progress']['current_index'] == 10
+
+
+def test_advance_keeps_buffered_progress_when_rejected(user_client, make_wordbook):
+    wordbook_id = make_wordbook(10)
+    client = user_client()
+
+    assert client.post(f'/api/progress/{wordbook_id}', json={'current_index': 4}).status_code == 200
+    assert client.post(f'/api/learn/{wordbook_id}/advance', json={'index': 99}).status_code == 400
+    assert client.post(f'/api/learn/{wordbook_id}/advance', json={'step': 1}).json['current_index'] == 5
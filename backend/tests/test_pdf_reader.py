@@ -0,0 +1,33 @@
+import glob
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import PDF_reader
+
+SAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', '..', '单词库', '*.pdf')))
+
+
+class _BrokenExecutor:
+    """子进程崩溃时的进程池：提交的任务全部以 BrokenProcessPool 结束"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool('worker killed')
+
+
+@pytest.mark.skipif(not SAMPLES, reason='没有示例 PDF')
+def test_broken_process_pool_falls_back_to_serial(monkeypatch):
+    expected = PDF_reader.extract_words_from_pdf(SAMPLES[0], workers=1)
+    monkeypatch.setattr(PDF_reader, 'ProcessPoolExecutor', _BrokenExecutor)
+
+    assert PDF_reader.extract_words_from_pdf(SAMPLES[0], workers=4) == expected
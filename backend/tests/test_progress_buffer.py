@@ -0,0 +1,52 @@
+import threading
+import time
+
+from app.extensions import db
+from app.models import UserProgress
+from app.services import progress_buffer
+
+
+def test_reset_waits_for_an_in_flight_flush(app, user_client, make_wordbook, monkeypatch):
+    wordbook_id = make_wordbook(10)
+    client = user_client()
+
+    assert client.post(f'/api/progress/{wordbook_id}', json={'current_index': 3}).status_code == 200
+    with app.app_context():
+        progress_buffer.flush_progress()
+    assert client.post(f'/api/progress/{wordbook_id}', json={'current_index': 5}).status_code == 200
+
+    # 让写入线程取走缓冲后停在写入之前
+    taken = threading.Event()
+    release = threading.Event()
+    write = progress_buffer._write
+
+    def slow_write(conn, rows):
+        taken.set()
+        release.wait(5)
+        write(conn, rows)
+
+    monkeypatch.setattr(progress_buffer, '_write', slow_write)
+
+    def flush():
+        with app.app_context():
+            progress_buffer.flush_progress()
+
+    flusher = threading.Thread(target=flush)
+    flusher.start()
+    assert taken.wait(5)
+
+    responses = []
+    resetter = threading.Thread(
+        target=lambda: responses.append(client.post(f'/api/progress/{wordbook_id}/reset').status_code)
+    )
+    resetter.start()
+    time.sleep(0.2)
+    release.set()
+    flusher.join(5)
+    resetter.join(5)
+
+    assert responses == [200]
+    with app.app_context():
+        progress = UserProgress.query.filter_by(wordbook_id=wordbook_id).one()
+        assert progress.current_index == 1
+        db.session.remove()
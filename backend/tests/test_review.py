@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.models import ReviewState, Wordbook
+
+
+def _word_ids(client, wordbook_id, count):
+    return [client.get(f'/api/words/{wordbook_id}/{n}').json['word']['id'] for n in range(1, count + 1)]
+
+
+def _make_due(word_ids):
+    ReviewState.query.filter(ReviewState.word_id.in_(word_ids)).update(
+        {'due_at': datetime(2000, 1, 1)}, synchronize_session=False
+    )
+    db.session.commit()
+
+
+def _soft_delete(app, wordbook_id):
+    """只标记删除，不触发清理"""
+    with app.app_context():
+        db.session.get(Wordbook, wordbook_id).deleted_at = datetime.utcnow()
+        db.session.commit()
+
+
+@pytest.mark.parametrize('grade', [
+    {'word_id': True, 'quality': 4},
+    {'word_id': 2 ** 70, 'quality': 4},
+    {'word_id': 0, 'quality': 4},
+    {'word_id': 1, 'quality': True},
+    {'word_id': 1, 'quality': 6},
+    {'word_id': 1},
+])
+def test_grade_rejects_invalid_input(user_client, grade):
+    response = user_client().post('/api/review/grade', json={'grades': [grade]})
+    assert response.status_code == 400
+
+
+def test_grade_schedules_words(user_client, make_wordbook):
+    wordbook_id = make_wordbook(3)
+    client = user_client()
+    first, second, _ = _word_ids(client, wordbook_id, 3)
+
+    data = client.post('/api/review/grade', json={'grades': [
+        {'word_id': first, 'quality': 5},
+        {'word_id': second, 'quality': 1},
+        {'word_id': 2 ** 31 - 1, 'quality': 3},
+    ]}).json
+    states = {state['word_id']: state for state in data['reviews']}
+    assert states[first]['repetitions'] == 1 and states[first]['lapses'] == 0
+    assert states[second]['repetitions'] == 0 and states[second]['lapses'] == 1
+    assert data['not_found'] == [2 ** 31 - 1]
+
+    # 刚评分的单词明天才到期
+    assert client.get('/api/review/next').json['count'] == 0
+
+
+def test_deleted_wordbook_words_are_not_reviewed(app, user_client, make_wordbook):
+    wordbook_id = make_wordbook(2)
+    client = user_client()
+    word_ids = _word_ids(client, wordbook_id, 2)
+
+    # 答错后到期时间为明天，改为已到期
+    client.post('/api/review/grade', json={'grades': [{'word_id': word_id, 'quality': 0} for word_id in word_ids]})
+    with app.app_context():
+        _make_due(word_ids)
+    assert client.get('/api/review/next').json['count'] == 2
+
+    with app.app_context():
+        _make_due(word_ids)
+    _soft_delete(app, wordbook_id)
+
+    assert client.get('/api/review/next').json['count'] == 0
+    data = client.post('/api/review/grade', json={'grades': [{'word_id': word_ids[0], 'quality': 4}]}).json
+    assert data['reviews'] == [] and data['not_found'] == [word_ids[0]]
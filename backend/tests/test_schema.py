@@ -0,0 +1,71 @@
+from flask import Flask
+from sqlalchemy import inspect, text
+
+from app.extensions import db
+from app.models.vocabulary import Vocabulary
+from app.models.word import Word
+from app.services.schema import upgrade_schema
+
+# 引入共享词条表之前的 words 表
+LEGACY_WORDS = '''
+CREATE TABLE words (
+    id INTEGER PRIMARY KEY,
+    wordbook_id INTEGER NOT NULL,
+    word VARCHAR(100) NOT NULL,
+    phonetic VARCHAR(100),
+    translation TEXT NOT NULL,
+    sort_order INTEGER NOT NULL,
+    created_at DATETIME,
+    CONSTRAINT unique_wordbook_sequence UNIQUE (wordbook_id, sort_order)
+)
+'''
+
+
+def _legacy_app(tmp_path):
+    legacy = Flask(__name__)
+    legacy.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{tmp_path / "legacy.db"}'
+    db.init_app(legacy)
+    with legacy.app_context():
+        db.create_all()
+        with db.engine.begin() as conn:
+            conn.execute(text('DROP TABLE words'))
+            conn.execute(text(LEGACY_WORDS))
+            conn.execute(text('DROP INDEX idx_user_added'))
+            conn.execute(text(
+                "INSERT INTO wordbooks (id, name, word_count, is_active, version) VALUES (1, 'a', 3, 1, 1), (2, 'b', 2, 1, 1)"
+            ))
+            conn.execute(text(
+                "INSERT INTO words VALUES (1, 1, 'apple', '/a/', '苹果', 1, NULL), (2, 1, 'book', '/b/', '书', 2, NULL),"
+                " (3, 1, 'cat', NULL, '猫', 3, NULL), (4, 2, 'apple', '/a/', '苹果', 1, NULL),"
+                " (5, 2, 'cat', NULL, '猫科动物', 2, NULL)"
+            ))
+            conn.execute(text('INSERT INTO vocabulary (user_id, word_id, added_at) VALUES (1, 1, NULL)'))
+    return legacy
+
+
+def test_upgrade_migrates_legacy_words(tmp_path):
+    legacy = _legacy_app(tmp_path)
+    with legacy.app_context():
+        upgrade_schema()
+        # 再次执行不做任何修改
+        upgrade_schema()
+
+        columns = {column['name'] for column in inspect(db.engine).get_columns('words')}
+        assert 'lexeme_id' in columns
+        assert not columns & {'word', 'phonetic', 'translation'}
+        assert 'idx_user_added' in {index['name'] for index in inspect(db.engine).get_indexes('vocabulary')}
+
+        assert {word.id: (word.word, word.phonetic, word.translation) for word in Word.query} == {
+            1: ('apple', '/a/', '苹果'),
+            2: ('book', '/b/', '书'),
+            3: ('cat', None, '猫'),
+            4: ('apple', '/a/', '苹果'),
+            5: ('cat', None, '猫科动物'),
+        }
+        # 内容相同的单词共用一个词条
+        lexeme_ids = dict(db.session.query(Word.id, Word.lexeme_id))
+        assert lexeme_ids[1] == lexeme_ids[4]
+        assert lexeme_ids[3] != lexeme_ids[5]
+
+        assert Vocabulary.query.one().added_at is not None
+        db.session.remove()
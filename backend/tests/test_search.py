@@ -0,0 +1,52 @@
+from app.services.search_index import IndexSegment, drop_wordbook
+
+
+def _segment(words):
+    return IndexSegment(1, 1, range(101, len(words) + 101), range(1, len(words) + 1), words, [''] * len(words), [''] * len(words))
+
+
+def test_prefix_ranks_shortest_words_across_the_whole_range():
+    words = ['a', 'aback', 'abandon', 'abate', 'abbey', 'abbot', 'able', 'about', 'an', 'as', 'at']
+    segment = _segment(words)
+
+    matches = [words[i] for _, i in segment.prefix('a', 5)]
+    assert matches == ['a', 'an', 'as', 'at', 'able']
+    assert segment.prefix('a', 5)[0][0] == 0
+
+
+def test_search_prefers_short_words(user_client, make_wordbook):
+    make_wordbook([('zqalpha', '', '甲'), ('zqa', '', '乙'), ('zqab', '', '丙'), ('zqbeta', '', '丁')])
+    client = user_client()
+
+    results = client.get('/api/search', query_string={'q': 'ZQA', 'limit': 2}).json['results']
+    assert [result['word'] for result in results] == ['zqa', 'zqab']
+
+
+def test_mixed_query_keeps_the_non_chinese_part(user_client, make_wordbook):
+    make_wordbook([
+        ('zqrun', '', '跑；奔跑'), ('zqjog', '', '慢跑'),
+        ('zqone', '', '混合释义1'), ('zqtwo', '', '混合释义2'),
+    ])
+    client = user_client()
+
+    def words(q):
+        return [result['word'] for result in client.get('/api/search', query_string={'q': q}).json['results']]
+
+    assert words('混合释义2') == ['zqtwo']
+    assert words('zqrun 跑') == ['zqrun']
+    assert sorted(words('跑')) == ['zqjog', 'zqrun']
+    assert words('混合 释义1') == ['zqone']
+
+
+def test_results_carry_word_ids(user_client, make_wordbook):
+    wordbook_id = make_wordbook([('zqidfirst', '', '编号一'), ('zqidsecond', '', '编号二')])
+    client = user_client()
+
+    result, = client.get('/api/search', query_string={'q': 'zqidsecond'}).json['results']
+    word = client.get(f'/api/words/{wordbook_id}/2').json['word']
+    assert result['id'] == word['id']
+
+    # 从单词书内容缓存重新建立的分段同样带有ID
+    drop_wordbook(wordbook_id)
+    assert client.get('/api/search', query_string={'q': 'zqidsecond'}).json['results'][0]['id'] == word['id']
+    assert client.post('/api/vocabulary', json={'word_id': result['id']}).status_code == 201
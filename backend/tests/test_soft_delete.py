@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from flask_jwt_extended import decode_token
+
+from app.extensions import db
+from app.models import User, UserProgress, Vocabulary, Word, Wordbook
+from app.routes import admin
+
+
+def _word_id(client, wordbook_id, sequence=1):
+    return client.get(f'/api/words/{wordbook_id}/{sequence}').json['word']['id']
+
+
+def _user_id(app, client):
+    with app.app_context():
+        return int(decode_token(client.environ_base['HTTP_AUTHORIZATION'][7:])['sub'])
+
+
+def test_words_of_deleted_wordbooks_cannot_be_added(app, user_client, make_wordbook):
+    wordbook_id = make_wordbook(3)
+    client = user_client()
+    word_ids = [_word_id(client, wordbook_id, n) for n in (1, 2)]
+
+    # 只标记删除，不触发清理
+    with app.app_context():
+        db.session.get(Wordbook, wordbook_id).deleted_at = datetime.utcnow()
+        db.session.commit()
+
+    assert client.post('/api/vocabulary', json={'word_id': word_ids[0]}).status_code == 404
+    data = client.post('/api/vocabulary/batch', json={'word_ids': word_ids}).json
+    assert data['not_found'] == word_ids
+    with app.app_context():
+        assert Vocabulary.query.filter(Vocabulary.word_id.in_(word_ids)).count() == 0
+
+
+def test_deleted_user_frees_username_and_email_before_purge(app, admin_client, user_client, monkeypatch):
+    monkeypatch.setattr(admin, 'schedule_purge', lambda: None)
+    client = user_client('reuse_me')
+    user_id = _user_id(app, client)
+
+    assert admin_client.delete(f'/admin/api/users/{user_id}').status_code == 200
+    with app.app_context():
+        assert db.session.get(User, user_id).deleted_at is not None
+
+    # 旧令牌立即失效，用户名和邮箱可以立即重新注册
+    assert client.get('/api/vocabulary/word-ids').status_code == 401
+    response = app.test_client().post('/api/auth/register', json={
+        'username': 'reuse_me', 'email': 'reuse_me@example.com', 'password': 'secret1'
+    })
+    assert response.status_code == 201
+
+
+def test_purge_removes_wordbook_and_user_data(app, admin_client, user_client, make_wordbook):
+    wordbook_id = make_wordbook(3)
+    client = user_client()
+    user_id = _user_id(app, client)
+    word_id = _word_id(client, wordbook_id)
+    assert client.post('/api/vocabulary', json={'word_id': word_id}).status_code == 201
+    assert client.post(f'/api/learn/{wordbook_id}/advance', json={'index': 2}).status_code == 200
+
+    # 测试环境 PURGE_ASYNC=0，删除请求内完成清理
+    assert admin_client.delete(f'/admin/api/wordbooks/{wordbook_id}').json['success']
+    with app.app_context():
+        assert db.session.get(Wordbook, wordbook_id) is None
+        assert Word.query.filter_by(wordbook_id=wordbook_id).count() == 0
+        assert Vocabulary.query.filter_by(word_id=word_id).count() == 0
+        assert UserProgress.query.filter_by(wordbook_id=wordbook_id).count() == 0
+    assert client.get(f'/api/words/{wordbook_id}/1').status_code == 404
+    assert client.get('/api/vocabulary/word-ids').json['word_ids'] == []
+
+    assert admin_client.delete(f'/admin/api/users/{user_id}').status_code == 200
+    with app.app_context():
+        assert db.session.get(User, user_id) is None
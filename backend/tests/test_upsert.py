@@ -0,0 +1,86 @@
+import threading
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import User, UserProgress, Vocabulary, Word
+from app.services.progress_buffer import progress_upsert
+from app.services.upsert import upsert, was_inserted
+from app.services.word_importer import import_wordbook
+
+THREADS = 8
+OPS = 20
+
+
+def _setup(app, name):
+    with app.app_context():
+        user = User(username=name, email=f'{name}@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        wordbook, _ = import_wordbook(name, [('upsert', '', '测试')])
+        word_id = Word.query.filter_by(wordbook_id=wordbook.id).one().id
+        return user.id, wordbook.id, word_id
+
+
+def _hammer(app, operation):
+    """多个线程同时执行 operation，返回各类异常"""
+    errors = []
+    barrier = threading.Barrier(THREADS)
+
+    def worker(n):
+        with app.app_context():
+            barrier.wait()
+            for i in range(OPS):
+                try:
+                    operation(n * OPS + i)
+                except Exception as e:
+                    db.session.rollback()
+                    errors.append(e)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(THREADS)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return errors
+
+
+def test_concurrent_progress_upserts_keep_one_row(app):
+    user_id, wordbook_id, _ = _setup(app, 'upsert_progress')
+
+    def operation(n):
+        db.session.execute(progress_upsert(), {
+            'user_id': user_id,
+            'wordbook_id': wordbook_id,
+            'current_index': n + 1,
+            'last_learn_time': datetime.utcnow()
+        })
+        db.session.commit()
+
+    errors = _hammer(app, operation)
+    assert not [e for e in errors if isinstance(e, IntegrityError)]
+    assert not errors
+    with app.app_context():
+        assert UserProgress.query.filter_by(user_id=user_id, wordbook_id=wordbook_id).count() == 1
+
+
+def test_concurrent_vocabulary_upserts_insert_once(app):
+    user_id, _, word_id = _setup(app, 'upsert_vocabulary')
+    inserted = []
+
+    def operation(n):
+        result = db.session.execute(
+            upsert(Vocabulary.__table__, ['user_id', 'word_id']),
+            {'user_id': user_id, 'word_id': word_id}
+        )
+        db.session.commit()
+        if was_inserted(result):
+            inserted.append(n)
+
+    errors = _hammer(app, operation)
+    assert not [e for e in errors if isinstance(e, IntegrityError)]
+    assert not errors
+    assert len(inserted) == 1
+    with app.app_context():
+        assert Vocabulary.query.filter_by(user_id=user_id, word_id=word_id).count() == 1
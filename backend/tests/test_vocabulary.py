@@ -0,0 +1,81 @@
+from sqlalchemy import event
+
+from app.extensions import db
+from app.services import vocabulary_cache
+
+
+def _during_membership_reload(app, user_id, action):
+    """在重新加载生词本成员集合的查询执行前调用 action，模拟并发的修改"""
+    done = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if not done and 'FROM vocabulary' in statement:
+            done.append(True)
+            action()
+
+    with app.app_context():
+        engine = db.engine
+        event.listen(engine, 'before_cursor_execute', before)
+        try:
+            return vocabulary_cache.get_membership(user_id)
+        finally:
+            event.remove(engine, 'before_cursor_execute', before)
+
+
+def test_changes_during_reload_are_not_lost(app):
+    user_id = 900001
+    membership = _during_membership_reload(app, user_id, lambda: vocabulary_cache.record_added(user_id, [7]))
+    assert 7 in membership
+    with app.app_context():
+        assert 7 in vocabulary_cache.get_membership(user_id)
+
+    vocabulary_cache.invalidate_vocabulary(user_id)
+    with app.app_context():
+        vocabulary_cache.get_membership(user_id)
+    vocabulary_cache._memberships[user_id].loaded_at = 0
+    membership = _during_membership_reload(app, user_id, lambda: vocabulary_cache.record_removed(user_id, [7]))
+    assert 7 not in membership
+
+
+def test_invalidation_during_reload_is_not_cached(app):
+    user_id = 900002
+    _during_membership_reload(app, user_id, lambda: vocabulary_cache.invalidate_vocabulary(user_id))
+    assert user_id not in vocabulary_cache._memberships
+    assert user_id not in vocabulary_cache._reloads
+
+
+
+def test_batch_add_and_cursor_paging(app, user_client, make_wordbook):
+    from app.models.vocabulary import Vocabulary
+    from app.models.word import Word
+    from app.services.schema import upgrade_schema
+
+    wordbook_id = make_wordbook(7)
+    client = user_client()
+    with app.app_context():
+        word_ids = [word_id for word_id, in db.session.query(Word.id).filter_by(wordbook_id=wordbook_id)]
+
+    response = client.post('/api/vocabulary/batch', json={'word_ids': word_ids + [word_ids[0], 2**31 - 1]})
+    assert response.json['added'] == 7
+    assert response.json['not_found'] == [2**31 - 1]
+    assert client.post('/api/vocabulary/batch', json={'word_ids': word_ids}).json['existing'] == 7
+
+    # 旧版数据的 added_at 可能为空，升级时补齐后游标才能编码
+    with app.app_context():
+        Vocabulary.query.filter_by(word_id=word_ids[0]).update({'added_at': None})
+        db.session.commit()
+        upgrade_schema()
+        assert Vocabulary.query.filter(Vocabulary.added_at.is_(None)).count() == 0
+
+    seen = []
+    cursor = None
+    while True:
+        data = client.get('/api/vocabulary', query_string={'limit': 3, **({'cursor': cursor} if cursor else {})}).json
+        seen.extend(item['word_id'] for item in data['vocabulary'])
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(word_ids)
+    # 补齐为最早时间的记录排在最后
+    assert seen[-1] == word_ids[0]
+    assert client.get('/api/vocabulary', query_string={'cursor': 'not-a-cursor'}).status_code == 400
@@ -0,0 +1,35 @@
+from app.services.catalog_cache import invalidate_catalog
+from app.services.word_importer import import_wordbook
+
+
+def _catalog_queries(statements):
+    return [s for s in statements if 'FROM wordbooks' in s]
+
+
+def test_catalog_query_count_is_constant(app, user_client, statements):
+    with app.app_context():
+        wordbook_ids = [
+            import_wordbook(f'catalog{n}', [(f'w{i}', '', '释义') for i in range(1, 4)], is_active=True)[0].id
+            for n in range(5)
+        ]
+
+    client = user_client()
+    for wordbook_id in wordbook_ids[:3]:
+        assert client.post(f'/api/progress/{wordbook_id}', json={'current_index': 2}).status_code == 200
+
+    # 先请求一次，令牌身份进入缓存，之后只统计本接口自身的查询
+    assert client.get('/api/wordbooks').status_code == 200
+
+    invalidate_catalog()
+    statements.clear()
+    response = client.get('/api/wordbooks')
+    assert response.status_code == 200
+    assert len(response.json['wordbooks']) >= 5
+    assert len(_catalog_queries(statements)) <= 1
+    assert len(statements) <= 1
+
+    statements.clear()
+    response = client.get('/api/wordbooks')
+    assert response.status_code == 200
+    assert len(_catalog_queries(statements)) == 0
+    assert len(statements) <= 1
@@ -12,6 +12,14 @@ export const useLearningStore = defineStore('learning', () => {
   })
   const wordbookId = ref(null)
   const loading = ref(false)
+  // advance 接口返回的预取单词，按序号索引
+  const prefetched = new Map()
+  // 整本单词书快照（序号 -> 单词）和生词本中的单词ID，加载后学习时不再逐词请求
+  let snapshot = null
+  let vocabularyIds = new Set()
+  // 待上报的学习事件，攒够一批再发送
+  let pendingEvents = []
+  const EVENT_BATCH_SIZE = 20
   
   async function fetchProgress(id) {
     wordbookId.value = id
@@ -22,7 +30,58 @@ export const useLearningStore = defineStore('learning', () => {
     return response
   }
   
+  // 下载整本单词书的压缩快照，失败时保持逐词请求
+  async function loadSnapshot(id) {
+    snapshot = null
+    try {
+      const [data, vocabulary] = await Promise.all([
+        http.get(`/words/snapshot/${id}`),
+        http.get('/vocabulary/word-ids', { params: { wordbook_id: id } })
+      ])
+      const { columns, strings } = data
+      const words = new Map()
+      let wordId = 0
+      let sequence = 0
+      for (let i = 0; i < data.count; i++) {
+        wordId += columns.id[i]
+        sequence += columns.sequence[i]
+        words.set(sequence, {
+          id: wordId,
+          wordbook_id: data.wordbook_id,
+          word: columns.word[i],
+          phonetic: strings[columns.phonetic[i]],
+          translation: strings[columns.translation[i]],
+          sequence
+        })
+      }
+      snapshot = { version: data.version, words }
+      vocabularyIds = new Set(vocabulary.word_ids)
+    } catch (error) {
+      snapshot = null
+    }
+    return snapshot
+  }
+  
+  function wordFromSnapshot(sequence) {
+    const word = snapshot && snapshot.words.get(sequence)
+    if (!word) {
+      return null
+    }
+    return {
+      ...word,
+      total_words: progress.value.total_words,
+      is_in_vocabulary: vocabularyIds.has(word.id)
+    }
+  }
+  
   async function fetchWord(id, sequence) {
+    const local = wordFromSnapshot(sequence)
+    if (local) {
+      currentWord.value = local
+      showTranslation.value = false
+      return { success: true, word: local }
+    }
+    
     loading.value = true
     try {
       const response = await http.get(`/words/${id}/${sequence}`)
@@ -49,19 +108,82 @@ export const useLearningStore = defineStore('learning', () => {
     return response
   }
   
+  // 移动进度并取回目标单词，一次请求完成
+  async function advance(newIndex) {
+    // 预取过的单词先直接显示，生词本标记以服务端返回为准
+    const cached = prefetched.get(newIndex)
+    if (cached) {
+      currentWord.value = { ...cached, total_words: progress.value.total_words }
+      showTranslation.value = false
+    }
+    
+    const response = await http.post(`/learn/${wordbookId.value}/advance`, {
+      index: newIndex
+    })
+    if (response.success) {
+      currentWord.value = response.word
+      if (!cached) {
+        showTranslation.value = false
+      }
+      progress.value.current_index = response.current_index
+      progress.value.total_words = response.total_words
+      progress.value.progress_percentage = response.progress_percentage
+      
+      prefetched.clear()
+      for (const word of response.prefetch) {
+        prefetched.set(word.sequence, word)
+      }
+    }
+    return response
+  }
+  
+  function recordEvent(wordId, action) {
+    pendingEvents.push({
+      word_id: wordId,
+      wordbook_id: wordbookId.value,
+      action,
+      timestamp: Date.now()
+    })
+    if (pendingEvents.length >= EVENT_BATCH_SIZE) {
+      flushEvents()
+    }
+  }
+  
+  // 上报失败不影响学习，丢弃这一批
+  async function flushEvents() {
+    if (pendingEvents.length === 0) return
+    const events = pendingEvents
+    pendingEvents = []
+    try {
+      await http.post('/events', { events })
+    } catch (error) {
+      console.error('上报学习事件失败:', error)
+    }
+  }
+  
+  // 有快照时在本地切换单词，只向服务端保存进度
+  async function moveTo(newIndex) {
+    const local = wordFromSnapshot(newIndex)
+    if (!local) {
+      return advance(newIndex)
+    }
+    currentWord.value = local
+    showTranslation.value = false
+    return updateProgress(newIndex)
+  }
+  
   async function nextWord() {
+    if (currentWord.value) {
+      recordEvent(currentWord.value.id, 'studied')
+    }
     if (progress.value.current_index < progress.value.total_words) {
-      const newIndex = progress.value.current_index + 1
-      await fetchWord(wordbookId.value, newIndex)
-      await updateProgress(newIndex)
+      await moveTo(progress.value.current_index + 1)
     }
   }
   
   async function previousWord() {
     if (progress.value.current_index > 1) {
-      const newIndex = progress.value.current_index - 1
-      await fetchWord(wordbookId.value, newIndex)
-      await updateProgress(newIndex)
+      await moveTo(progress.value.current_index - 1)
     }
   }
   
@@ -71,6 +193,10 @@ export const useLearningStore = defineStore('learning', () => {
   
   async function addToVocabulary(wordId) {
     const response = await http.post('/vocabulary', { word_id: wordId })
+    if (response.success) {
+      vocabularyIds.add(wordId)
+      recordEvent(wordId, 'vocab_add')
+    }
     if (response.success && currentWord.value) {
       currentWord.value.is_in_vocabulary = true
     }
@@ -79,6 +205,10 @@ export const useLearningStore = defineStore('learning', () => {
   
   async function removeFromVocabulary(wordId) {
     const response = await http.delete(`/vocabulary/word/${wordId}`)
+    if (response.success) {
+      vocabularyIds.delete(wordId)
+      recordEvent(wordId, 'vocab_remove')
+    }
     if (response.success && currentWord.value) {
       currentWord.value.is_in_vocabulary = false
     }
@@ -86,10 +216,14 @@ export const useLearningStore = defineStore('learning', () => {
   }
   
   function reset() {
+    flushEvents()
     currentWord.value = null
     showTranslation.value = false
     progress.value = { current_index: 1, total_words: 0, progress_percentage: 0 }
     wordbookId.value = null
+    prefetched.clear()
+    snapshot = null
+    vocabularyIds = new Set()
   }
   
   return {
@@ -99,8 +233,11 @@ export const useLearningStore = defineStore('learning', () => {
     wordbookId,
     loading,
     fetchProgress,
+    loadSnapshot,
     fetchWord,
     updateProgress,
+    advance,
+    flushEvents,
     nextWord,
     previousWord,
     toggleTranslation,